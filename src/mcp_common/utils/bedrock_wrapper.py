@@ -1,15 +1,25 @@
+import functools
 import json
 import logging
 import os
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List
 
-import boto3
 from dotenv import load_dotenv
 from fastapi import HTTPException
 
 from dotenv import load_dotenv
 from pathlib import Path
-from langchain_aws.chat_models.bedrock import ChatBedrock
+
+if TYPE_CHECKING:  # boto3 / langchain_aws are imported on first use, not at import time
+    from langchain_aws.chat_models.bedrock import ChatBedrock
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps  # bytes, accepted as-is by invoke_model(body=...)
+except ImportError:  # orjson is optional, stdlib json is a drop-in fallback
+    _json_loads = json.loads
+    _json_dumps = json.dumps
 
 
 load_dotenv(Path(__file__).resolve().parents[3] / ".env")
@@ -22,12 +32,18 @@ AWS_REGION = os.getenv("AWS_REGION")
 CLAUDE_MODEL_ID = os.getenv("CLAUDE_MODEL_ID", "None")
 NOVA_LITE_MODEL_ID = os.getenv("NOVA_LITE_MODEL_ID")
 
-bedrock_client = boto3.client(
-    service_name="bedrock-runtime",
-    region_name=AWS_REGION,
-    aws_access_key_id=AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-)
+@functools.lru_cache(maxsize=1)
+def get_bedrock_client():
+    """Shared bedrock-runtime client, created on the first LLM/embedding call."""
+    import boto3
+
+    return boto3.client(
+        service_name="bedrock-runtime",
+        region_name=AWS_REGION,
+        aws_access_key_id=AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+    )
+
 
 def call_claude(system_prompt: str, user_input: str) -> str:
     result = call_llm(CLAUDE_MODEL_ID, system_prompt, user_input)
@@ -52,15 +68,15 @@ def call_nova_lite(user_prompt: str) -> str:
             ]
         }
 
-        response = bedrock_client.invoke_model(
+        response = get_bedrock_client().invoke_model(
             modelId=NOVA_LITE_MODEL_ID,
-            body=json.dumps(body),
+            body=_json_dumps(body),
             accept="application/json",
             contentType="application/json"
         )
 
         raw = response["body"].read()
-        response_body = json.loads(raw)
+        response_body = _json_loads(raw)
 
         # Extract assistant message
         message = response_body.get("output", {}).get("message", {})
@@ -86,8 +102,10 @@ def call_nova_lite(user_prompt: str) -> str:
 
 
 
-def init_chat_model(model_key: str = "NOVA_LITE_MODEL_ID") -> ChatBedrock:
+def init_chat_model(model_key: str = "NOVA_LITE_MODEL_ID") -> "ChatBedrock":
     """Initialize the Bedrock chat model."""
+    from langchain_aws.chat_models.bedrock import ChatBedrock
+
     model_id = os.environ[model_key]
     region = os.environ["AWS_REGION"]
     return ChatBedrock(model=model_id, region=region, model_kwargs={"temperature": 0})
@@ -106,15 +124,15 @@ def call_llm(modelId: str, system_prompt: str, user_input: str) -> str:
     }
 
     try:
-        response = bedrock_client.invoke_model(
+        response = get_bedrock_client().invoke_model(
             modelId=modelId,
-            body=json.dumps(body),
+            body=_json_dumps(body),
             contentType="application/json",
             accept="application/json",
         )
 
         raw = response["body"].read().decode()
-        parsed = json.loads(raw)
+        parsed = _json_loads(raw)
         return parsed["content"][0]["text"].strip()
 
     except Exception as e:
@@ -122,13 +140,6 @@ def call_llm(modelId: str, system_prompt: str, user_input: str) -> str:
 
 
 # --- Titan Embedding ---
-bedrock_client = boto3.client(
-    service_name="bedrock-runtime",
-    region_name=AWS_REGION,
-    aws_access_key_id=AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-)
-
 
 def fetch_embedding(text: str) -> list[float]:
     """
@@ -139,15 +150,15 @@ def fetch_embedding(text: str) -> list[float]:
 
     try:
         payload = {"inputText": text}
-        response = bedrock_client.invoke_model(
+        response = get_bedrock_client().invoke_model(
             modelId="amazon.titan-embed-text-v2:0",
-            body=json.dumps(payload),
+            body=_json_dumps(payload),
             contentType="application/json",
             accept="application/json",
         )
         body = response["body"].read().decode()
         logging.info(f"Bedrock response body: {body}")
-        result = json.loads(body)
+        result = _json_loads(body)
 
         embedding = result.get("embedding")
         if not embedding or not isinstance(embedding, list):
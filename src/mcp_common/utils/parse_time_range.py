@@ -6,6 +6,11 @@ from fastapi import HTTPException
 
 from mcp_common.utils.bedrock_wrapper import call_claude
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional, stdlib json is a drop-in fallback
+    _json_loads = json.loads
 
 
 # Optional utility function (so it's reusable/testable)
@@ -46,7 +51,7 @@ Use today's date if needed for relative expressions. Return ONLY the JSON object
         response_text = fenced_match.group(1)
 
     try:
-        result = json.loads(response_text)
+        result = _json_loads(response_text)
 
         # Validate keys
         time_from = result.get("time_from")
@@ -4,7 +4,6 @@ import json
 import re
 import warnings
 from dotenv import load_dotenv
-from jira import JIRA
 from typing import Annotated, Dict, List
 
 from typing_extensions import TypedDict
@@ -16,6 +15,7 @@ from langgraph.graph.message import add_messages
 from langchain_core.tools import tool
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage, SystemMessage
 import mcp_jira.helpers as helpers
+from mcp_jira.client import get_jira
 
 # warnings.filterwarnings(action="ignore", message=r"datetime.datetime.utcnow")
 warnings.filterwarnings(
@@ -25,14 +25,9 @@ warnings.filterwarnings(
 )
 
 load_dotenv(override=True)
-JIRA_URL = os.getenv("JIRA_BASE_URL")
-JIRA_USER = os.getenv("JIRA_EMAIL","")
-JIRA_TOKEN = os.getenv("JIRA_API_TOKEN","")
-
 DEFAULT_CATEGORY = os.getenv("DEFAULT_PROJECT_CATEGORY", "")
-EXCLUDED_KEYS = [k.strip() for k in os.getenv("EXCLUDED_PROJECT_KEYS", "").split(",") if k.strip()]
+EXCLUDED_KEYS = frozenset(k.strip() for k in os.getenv("EXCLUDED_PROJECT_KEYS", "").split(",") if k.strip())
 
-jira = JIRA(server=JIRA_URL, basic_auth=(JIRA_USER, JIRA_TOKEN))
 
 def pretty_print_messages(state):
     print("💬 Conversation:\n" + "-" * 60)
@@ -112,8 +107,8 @@ def list_issue_type_statuses_tool(project_key: str) -> List[Dict[str, List[str]]
       ]
     """
     try:
-        # Assuming helpers.jira.issue_types_for_project exists and works.
-        issue_types = helpers.jira.issue_types_for_project(project_key)
+        # Assuming get_jira().issue_types_for_project exists and works.
+        issue_types = get_jira().issue_types_for_project(project_key)
         result = []
         for it in issue_types:
             statuses = getattr(it, "statuses", [])
@@ -210,7 +205,7 @@ def check_jql(jql: str) -> Dict:
     }
     """
     try:
-        count = jira.approximate_issue_count(jql_str=jql)
+        count = get_jira().approximate_issue_count(jql_str=jql)
         return {"jql": jql, "approximate_count": count}
     except Exception as e:
         return {"error": str(e), "jql": jql}
@@ -3,7 +3,6 @@ import os
 import json
 import re
 import warnings
-from jira import JIRA
 from langgraph.prebuilt import ToolNode
 from dotenv import load_dotenv
 from langchain_aws.chat_models.bedrock import ChatBedrock
@@ -16,6 +15,7 @@ from langgraph.graph.message import add_messages
 from langchain_core.tools import tool
 from mcp_common.utils.bedrock_wrapper import call_nova_lite
 import mcp_jira.helpers as helpers
+from mcp_jira.client import get_jira
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage, SystemMessage
 from langgraph_supervisor import create_supervisor
 from langchain_core.language_models import BaseChatModel
@@ -25,14 +25,9 @@ warnings.filterwarnings(action="ignore", message=r"datetime.datetime.utcnow")
 
 
 load_dotenv(override=True)
-JIRA_URL = os.getenv("JIRA_BASE_URL")
-JIRA_USER = os.getenv("JIRA_EMAIL", "")
-JIRA_TOKEN = os.getenv("JIRA_API_TOKEN", "")
-
 DEFAULT_CATEGORY = os.getenv("DEFAULT_PROJECT_CATEGORY", "")
-EXCLUDED_KEYS = [k.strip() for k in os.getenv("EXCLUDED_PROJECT_KEYS", "").split(",") if k.strip()]
+EXCLUDED_KEYS = frozenset(k.strip() for k in os.getenv("EXCLUDED_PROJECT_KEYS", "").split(",") if k.strip())
 
-jira = JIRA(server=JIRA_URL, basic_auth=(JIRA_USER, JIRA_TOKEN))
 
 
 def pretty_print_messages(update):
@@ -224,7 +219,7 @@ def resolve_types_and_statuses(
     status_set = set()
 
     for key in keys:
-        for issue_type in jira.issue_types_for_project(key):
+        for issue_type in get_jira().issue_types_for_project(key):
             issue_type_set.add(issue_type.name)
             for status in getattr(issue_type, "statuses", []):
                 status_set.add(status.name)
@@ -277,7 +272,7 @@ def resolve_project_names_tool(human_input: str) -> List[Dict[str, str]]:
 
     # Try to parse valid JSON from the response
     try:
-        match_data = json.loads(response)
+        match_data = helpers._json_loads(response)
         return [{"content": json.dumps({"matches": match_data.get("matches", [])})}]
 
     except Exception as e:
@@ -320,7 +315,7 @@ def resolve_project_names_tool(human_input: str) -> List[Dict[str, str]]:
 #     seen = set()
 #     combined_options = []
 #     for key in keys:
-#         for it in helpers.jira.issue_types_for_project(key):
+#         for it in get_jira().issue_types_for_project(key):
 #             type_name = it.name
 #             status_names = tuple(sorted(s.name for s in getattr(it, "statuses", [])))
 #             key_tuple = (type_name, status_names)
@@ -390,7 +385,7 @@ def check_jql(jql: str) -> Dict:
     }
     """
     try:
-        count = jira.approximate_issue_count(jql_str=jql)
+        count = get_jira().approximate_issue_count(jql_str=jql)
         return {"jql": jql, "approximate_count": count}
     except Exception as e:
         return {"error": str(e), "jql": jql}
@@ -509,7 +504,7 @@ def ask_agent_to_generate_jql(human_input: str) -> Optional[Dict[str, Union[str,
         matches = re.findall(r"```json\n(.*?)```", content, re.DOTALL)
         if matches:
             json_block = matches[0].strip()
-            parsed = json.loads(json_block)
+            parsed = helpers._json_loads(json_block)
             return parsed
         else:
             raise ValueError("No JSON block found in agent response.")
@@ -0,0 +1,41 @@
+import functools
+import os
+from typing import TYPE_CHECKING
+
+from dotenv import load_dotenv
+
+if TYPE_CHECKING:
+    from jira import JIRA  # Atlassian Python client
+
+
+load_dotenv(override=True)
+
+JIRA_URL = os.getenv("JIRA_BASE_URL", "")
+JIRA_USER = os.getenv("JIRA_EMAIL", "")
+JIRA_TOKEN = os.getenv("JIRA_API_TOKEN", "")
+
+
+@functools.lru_cache(maxsize=1)
+def get_jira() -> "JIRA":
+    """
+    Single Jira client shared by the MCP server, helpers and agents.
+    Built (and the jira package imported) on first use, so importing the server
+    does not block on Jira's handshake.
+    """
+    from jira import JIRA
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    client = JIRA(server=JIRA_URL, basic_auth=(JIRA_USER, JIRA_TOKEN))
+
+    # Bigger keep-alive pool so concurrent fetches reuse TLS connections instead of
+    # reopening them (requests defaults to 10). Transport-level failures (refused/reset
+    # connections) are retried here; HTTP 429/503 retries stay with ResilientSession.
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, connect=3, read=2, backoff_factor=0.3),
+    )
+    client._session.mount("https://", adapter)
+    client._session.mount("http://", adapter)
+    return client
@@ -1,44 +1,124 @@
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from dataclasses import dataclass
+import io
 import json
 import logging
 import textwrap
 import time
-from typing import Any, Counter, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+import functools
+from operator import attrgetter, itemgetter
+import threading
 from difflib import get_close_matches
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import HTTPException
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from dateutil import parser as date_parser
 import re
-from jira import JIRA  # Atlassian Python client
 import os
 from dotenv import load_dotenv
 import re
 from datetime import datetime, timezone
-from collections import Counter, defaultdict
+from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Dict, DefaultDict
 from datetime import datetime
-import pytz
 from fastapi import HTTPException
 
+from mcp_common.utils.bedrock_wrapper import call_nova_lite
+from mcp_jira.client import get_jira
 
-import pytz
-from mcp_common.utils.bedrock_wrapper import call_claude, call_nova_lite
-from mcp_jira.main import extract_issue_fields
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional, stdlib json is a drop-in fallback
+    _json_loads = json.loads
+
+if TYPE_CHECKING:
+    from jira import JIRA  # Atlassian Python client
 # from mcp_jira.helpers import get_clean_comments_from_issue
 
 
 load_dotenv(override=True)
 
+logger = logging.getLogger(__name__)
 
-JIRA_URL = os.getenv("JIRA_BASE_URL", "")
-JIRA_USER = os.getenv("JIRA_EMAIL","")
-JIRA_TOKEN = os.getenv("JIRA_API_TOKEN","")
 
 DEFAULT_CATEGORY = os.getenv("DEFAULT_PROJECT_CATEGORY", "")
-EXCLUDED_KEYS = [k.strip() for k in os.getenv("EXCLUDED_PROJECT_KEYS", "").split(",") if k.strip()]
+UTC = timezone.utc
+JIRA_MAX_WORKERS = int(os.getenv("JIRA_MAX_WORKERS", "8"))  # cap on concurrent Jira requests per call
+EXCLUDED_KEYS = frozenset(k.strip() for k in os.getenv("EXCLUDED_PROJECT_KEYS", "").split(",") if k.strip())
+
+# JSON extraction from LLM replies
+_JSON_OBJ_RE = re.compile(r"\{.*?\}", re.DOTALL)    # first (flat) object
+_JSON_BLOCK_RE = re.compile(r"\{.*\}", re.DOTALL)   # outermost object, may be nested
+_JSON_ARR_RE = re.compile(r"\[.*?\]", re.DOTALL)    # first array
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_json_object(text: str) -> Optional[Any]:
+    """Decode the first JSON object embedded in `text`, or None if there is none.
+
+    raw_decode scans linearly from the first "{" and stops at its matching brace;
+    the greedy block regex is only a fallback for replies it cannot decode.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+    try:
+        return _JSON_DECODER.raw_decode(text, start)[0]
+    except json.JSONDecodeError:
+        match = _JSON_BLOCK_RE.search(text, start)
+        return _json_loads(match.group(0)) if match else None
+
+
+# -------------------------------------------------------------------
+# TTL memoization for Jira metadata (statuses, priorities, projects, ...)
+# -------------------------------------------------------------------
+
+# (cache, the lock guarding it) for every cache invalidate_cache() clears
+_CACHE_REGISTRY: List[Tuple[Dict[Any, Any], threading.Lock]] = []
+
+
+def _ttl_cache(seconds: float):
+    """
+    Memoize a function per call arguments for `seconds`.
+    Exceptions are not cached; `invalidate_cache()` clears every decorated function.
+    """
+    def decorator(func):
+        cache: Dict[Any, Tuple[float, Any]] = {}
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with lock:
+                hit = cache.get(key)
+            if hit is not None and now - hit[0] < seconds:
+                return hit[1]
+
+            value = func(*args, **kwargs)
+            with lock:
+                cache[key] = (now, value)
+            return value
+
+        def cache_clear() -> None:
+            with lock:
+                cache.clear()
 
-jira = JIRA(server=JIRA_URL, basic_auth=(JIRA_USER, JIRA_TOKEN))
+        wrapper.cache_clear = cache_clear
+        _CACHE_REGISTRY.append((cache, lock))
+        return wrapper
+
+    return decorator
+
+
+def invalidate_cache() -> None:
+    """Drop all cached Jira metadata and issues so the next call hits the server."""
+    for cache, lock in _CACHE_REGISTRY:
+        with lock:
+            cache.clear()
 
 
 
@@ -62,19 +142,34 @@ def _approximate_jira_issue_count(jql: str) -> Dict:
     }
     """
     try:
-        count = jira.approximate_issue_count(jql_str=jql)
+        count = get_jira().approximate_issue_count(jql_str=jql)
         return {"jql": jql, "approximate_count": count}
     except Exception as e:
         return {"error": str(e), "jql": jql}
 
 
+def _embedded_comments(issue) -> Optional[list]:
+    """
+    Comments returned inline with the issue (requested via the `comment` field).
+    None when they were not requested or Jira truncated them (total > returned),
+    so callers fall back to a full jira.comments() call only in that case.
+    """
+    comment_field = getattr(issue.fields, "comment", None)
+    comments = getattr(comment_field, "comments", None)
+    if comments is not None and getattr(comment_field, "total", 0) > len(comments):
+        return None
+    return comments
+
+
 def get_clean_comments_from_issue(jira, issue) -> list[dict]:
     """
     Returns raw comments from a Jira issue, including author and created timestamp.
     No filtering or cleaning is applied to avoid losing useful content.
     """
     try:
-        comments = jira.comments(issue)
+        comments = _embedded_comments(issue)
+        if comments is None:
+            comments = jira.comments(issue)
         return [
             {
                 "author": c.author.displayName,
@@ -87,30 +182,236 @@ def get_clean_comments_from_issue(jira, issue) -> list[dict]:
         return [{"error": str(e)}]
 
 
+# search/jql page sizes. Pages are chained by an opaque nextPageToken, so they cannot be
+# fetched in parallel; larger pages are the way to cut round trips. Jira caps the page
+# server-side (higher when fewer fields are requested) and simply returns fewer items.
+_SEARCH_PAGE_SIZE = 1000
+_KEY_PAGE_SIZE = 5000  # Jira Cloud's page cap when only keys/ids are requested
+
+
+def _iter_jql_issues(jql: str, fields: List[str], page_size: int = _SEARCH_PAGE_SIZE) -> Iterator[Dict]:
+    """Yield raw issue dicts matching `jql` page by page; only one page is held at a time."""
+    next_page_token = None
+
+    while True:
+        response = get_jira().enhanced_search_issues(
+            jql_str=jql,
+            nextPageToken=next_page_token,
+            maxResults=page_size,
+            fields=fields,
+            use_post=True,
+            json_result=True
+        )
+
+        issues = response.get("issues", [])
+        if not issues:
+            return
+
+        yield from issues
+        next_page_token = response.get("nextPageToken")
+
+        if not next_page_token:
+            return
+
+
+# Fields read by _extract_issue_fields; request only these instead of every (custom) field
+_ISSUE_FIELDS = "summary,status,priority,assignee,reporter,created,updated,resolution"
+_FIELDS_GETTER = attrgetter(*_ISSUE_FIELDS.split(","))
+
+
 def _extract_issue_fields(issue, include_comments=False, jira_client=None) -> dict:
     """Pure Python helper to extract fields from a Jira issue."""
     fields = issue.fields
+    try:
+        summary, status, priority, assignee, reporter, created, updated, resolution = _FIELDS_GETTER(fields)
+    except AttributeError:
+        # Field hidden or not requested: fall back to per-field lookups
+        summary, status, priority, assignee, reporter, created, updated, resolution = (
+            getattr(fields, name, None) for name in _ISSUE_FIELDS.split(",")
+        )
+
     data = {
         "key": issue.key,
-        "summary": getattr(fields, "summary", ""),
-        "status": getattr(fields.status, "name", "Unknown"),
-        "priority": getattr(fields.priority, "name", "None"),
-        "assignee": getattr(fields.assignee, "displayName", "Unassigned"),
-        "reporter": getattr(fields.reporter, "displayName", "Unknown"),
-        "created": getattr(fields, "created", None),
-        "updated": getattr(fields, "updated", None),
-        "resolution": getattr(fields, "resolution", None),
+        "summary": summary or "",
+        "status": getattr(status, "name", "Unknown"),
+        "priority": getattr(priority, "name", "None"),
+        "assignee": getattr(assignee, "displayName", "Unassigned"),
+        "reporter": getattr(reporter, "displayName", "Unknown"),
+        "created": created,
+        "updated": updated,
+        "resolution": getattr(resolution, "name", None),
     }
 
     if include_comments and jira_client:
         try:
-            comments = jira_client.comments(issue.key)
+            comments = _embedded_comments(issue)
+            if comments is None:
+                comments = jira_client.comments(issue.key)
             data["comments"] = [c.body for c in comments]
         except Exception:
             data["comments"] = []
 
     return data
 
+
+def _issue_fields_from_json(issue: Dict) -> dict:
+    """_extract_issue_fields for a raw search/jql issue dict (json_result=True), no Issue objects."""
+    fields = issue.get("fields") or {}
+    return {
+        "key": issue.get("key"),
+        "summary": fields.get("summary") or "",
+        "status": (fields.get("status") or {}).get("name", "Unknown"),
+        "priority": (fields.get("priority") or {}).get("name", "None"),
+        "assignee": (fields.get("assignee") or {}).get("displayName", "Unassigned"),
+        "reporter": (fields.get("reporter") or {}).get("displayName", "Unknown"),
+        "created": fields.get("created"),
+        "updated": fields.get("updated"),
+        "resolution": (fields.get("resolution") or {}).get("name"),
+    }
+
+
+def _search_issues(jql: str, max_results: int = 5) -> List[Dict[str, str]]:
+    """Search Jira issues using a JQL query and return their keys and summaries."""
+    response = get_jira().enhanced_search_issues(
+        jql_str=jql,
+        maxResults=max_results,
+        fields=["summary"],
+        use_post=True,
+        json_result=True
+    )
+    return [
+        {"key": issue["key"], "summary": (issue.get("fields") or {}).get("summary")}
+        for issue in response.get("issues", [])
+    ]
+
+
+# Extracted issues, LRU-bounded. Within the TTL an entry is served as is; after that a
+# fields=updated probe revalidates it, so unchanged issues cost one tiny request.
+_ISSUE_CACHE_SIZE = int(os.getenv("JIRA_ISSUE_CACHE_SIZE", "1024"))
+_ISSUE_CACHE_TTL = float(os.getenv("JIRA_ISSUE_CACHE_TTL", "60"))
+_ISSUE_CACHE: "OrderedDict[Tuple[str, bool], Tuple[float, Any, dict]]" = OrderedDict()
+_ISSUE_CACHE_LOCK = threading.Lock()
+_CACHE_REGISTRY.append((_ISSUE_CACHE, _ISSUE_CACHE_LOCK))
+
+
+def _cached_issue_fields(key: str, include_comments: bool) -> dict:
+    """
+    _extract_issue_fields for `key`, served from _ISSUE_CACHE while the issue is unchanged.
+    Callers get their own copy of the cached dict.
+    """
+    cache_key = (key.strip().upper(), include_comments)
+    now = time.monotonic()
+    with _ISSUE_CACHE_LOCK:
+        hit = _ISSUE_CACHE.get(cache_key)
+        if hit is not None:
+            _ISSUE_CACHE.move_to_end(cache_key)
+
+    if hit is not None:
+        stored_at, updated, data = hit
+        if now - stored_at < _ISSUE_CACHE_TTL:
+            return dict(data)
+        probe = get_jira().issue(key, fields="updated")
+        if getattr(probe.fields, "updated", None) == updated:
+            with _ISSUE_CACHE_LOCK:
+                _ISSUE_CACHE[cache_key] = (now, updated, data)
+            return dict(data)
+
+    jira_client = get_jira()
+    issue = jira_client.issue(key, fields=f"{_ISSUE_FIELDS},comment" if include_comments else _ISSUE_FIELDS)
+    data = _extract_issue_fields(issue, include_comments=include_comments, jira_client=jira_client if include_comments else None)
+
+    with _ISSUE_CACHE_LOCK:
+        _ISSUE_CACHE[cache_key] = (now, data["updated"], data)
+        _ISSUE_CACHE.move_to_end(cache_key)
+        while len(_ISSUE_CACHE) > _ISSUE_CACHE_SIZE:
+            _ISSUE_CACHE.popitem(last=False)
+    return dict(data)
+
+
+def _get_issue(key: str) -> dict:
+    """Retrieve full details (including comments) for a Jira issue by key."""
+    return _cached_issue_fields(key, include_comments=True)
+
+
+def _extract_issue_fields_by_key(ticket_key: str, include_comments: bool = False) -> dict:
+    """Fetch an issue by key and extract its fields, optionally with comments."""
+    try:
+        return _cached_issue_fields(ticket_key, include_comments)
+    except Exception as e:
+        raise RuntimeError(f"Failed to extract fields for {ticket_key}: {e}") from e
+
+
+def _get_available_issue_statuses(key: str) -> List[str]:
+    """Display names of the statuses the given issue can transition to."""
+    try:
+        transitions = get_jira().transitions(key)
+        return [t['to']['name'] for t in transitions]
+    except Exception as e:
+        return [f"Error: {str(e)}"]
+
+
+@_ttl_cache(600)
+def _get_all_issue_types() -> List[str]:
+    """De-duplicated, sorted list of globally available issue type names."""
+    try:
+        global_issue_types = get_jira().issue_types()
+        issue_type_set = {it.name for it in global_issue_types}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch global issue types: {e}")
+
+    return sorted(issue_type_set)
+
+
+@_ttl_cache(3600)
+def _fetch_project_statuses(project_key: str) -> List[str]:
+    """Sorted unique status names allowed across all issue types of a project (via createmeta)."""
+    statuses = set()
+
+    # A project-scoped createmeta already lists every issue type, so no project
+    # lookup or issuetypeNames filter is needed
+    meta = get_jira().createmeta(projectKeys=project_key, expand="projects.issuetypes.fields")
+    for project_meta in meta.get('projects', []):
+        for itype in project_meta.get('issuetypes', []):
+            status_field = itype.get('fields', {}).get('status') or {}
+            statuses.update(s['name'] for s in status_field.get('allowedValues', []))
+
+    return sorted(statuses)
+
+
+def _get_all_statuses_for_project(project_key: str) -> List[str]:
+    """Sorted unique status names allowed across all issue types of a project."""
+    try:
+        return _fetch_project_statuses(project_key)
+    except Exception as e:
+        return [f"Error: {str(e)}"]
+
+
+_SHORT_RE = re.compile(r"^-(\d+)([dwmy])$")
+_SHORT_UNIT_DAYS = {"d": 1, "w": 7, "m": 30, "y": 365}
+
+# Keyword → start date, evaluated against the current UTC time
+_KEYWORDS = {
+    "today": lambda now: now,
+    "now": lambda now: now,
+    "yesterday": lambda now: now - timedelta(days=1),
+    "last week": lambda now: now - timedelta(days=now.weekday() + 7),
+    "this week": lambda now: now - timedelta(days=now.weekday()),
+    "last month": lambda now: datetime(now.year - (now.month == 1), (now.month - 2) % 12 + 1, 1),
+    "this month": lambda now: datetime(now.year, now.month, 1),
+    "last year": lambda now: datetime(now.year - 1, 1, 1),
+    "this year": lambda now: datetime(now.year, 1, 1),
+}
+
+
+def _iso(d: date) -> str:
+    """YYYY-MM-DD without going through strftime."""
+    return f"{d.year:04d}-{d.month:02d}-{d.day:02d}"
+
+
+# Two defaults differing in year, month and day (see _parse_jira_date)
+_DATE_DEFAULTS = (datetime(2000, 1, 1), datetime(2001, 2, 2))
+
+
 def _parse_jira_date(input_str: str) -> str:
     """
     Parses flexible date inputs into Jira-compatible YYYY-MM-DD format.
@@ -121,76 +422,38 @@ def _parse_jira_date(input_str: str) -> str:
     - Date strings: 2025-07-01, 07/01/2025, 1 Jul 2025, July 1, 2025, etc.
     """
     input_str = input_str.strip().lower()
-    now = datetime.now(timezone.utc)
-
-    # Handle natural keywords
-    if input_str in ["today", "now"]:
-        return now.strftime("%Y-%m-%d")
-    if input_str == "yesterday":
-        return (now - timedelta(days=1)).strftime("%Y-%m-%d")
-
-    # Handle relative phrases
-    if input_str == "last week":
-        last_week_start = now - timedelta(days=now.weekday() + 7)
-        return last_week_start.strftime("%Y-%m-%d")
-    if input_str == "this week":
-        this_week_start = now - timedelta(days=now.weekday())
-        return this_week_start.strftime("%Y-%m-%d")
-
-    if input_str == "last month":
-        year = now.year
-        month = now.month - 1
-        if month == 0:
-            month = 12
-            year -= 1
-        return datetime(year, month, 1).strftime("%Y-%m-%d")
-
-    if input_str == "this month":
-        return datetime(now.year, now.month, 1).strftime("%Y-%m-%d")
-
-    if input_str == "last year":
-        return datetime(now.year - 1, 1, 1).strftime("%Y-%m-%d")
-
-    if input_str == "this year":
-        return datetime(now.year, 1, 1).strftime("%Y-%m-%d")
+    now = datetime.now(UTC)
+
+    # Handle natural keywords and relative phrases
+    keyword = _KEYWORDS.get(input_str)
+    if keyword:
+        return _iso(keyword(now))
 
     # Handle shorthands like -3d, -2w, etc.
-    match = re.match(r"^-(\d+)([dwmy])$", input_str)
+    match = _SHORT_RE.match(input_str)
     if match:
-        amount = int(match.group(1))
-        unit = match.group(2)
-        delta = timedelta(days={
-            "d": amount,
-            "w": 7 * amount,
-            "m": 30 * amount,
-            "y": 365 * amount
-        }[unit])
-        return (now - delta).strftime("%Y-%m-%d")
-
-    # Try parsing flexible date formats
-    known_formats = [
-        "%Y-%m-%d",         # 2025-07-01
-        "%d/%m/%Y",         # 01/07/2025 (EU)
-        "%m/%d/%Y",         # 07/01/2025 (US)
-        "%d-%m-%Y",         # 01-07-2025
-        "%m-%d-%Y",         # 07-01-2025
-        "%d %b %Y",         # 1 Jul 2025
-        "%d %B %Y",         # 1 July 2025
-        "%B %d, %Y",        # July 1, 2025
-        "%b %d, %Y",        # Jul 1, 2025
-    ]
+        delta = timedelta(days=int(match.group(1)) * _SHORT_UNIT_DAYS[match.group(2)])
+        return _iso(now - delta)
 
-    for fmt in known_formats:
-        try:
-            parsed = datetime.strptime(input_str, fmt)
-            return parsed.strftime("%Y-%m-%d")
-        except ValueError:
-            continue
+    # ISO dates first (dateutil with dayfirst would swap month and day here)
+    try:
+        return _iso(date.fromisoformat(input_str))
+    except ValueError:
+        pass
 
-    raise ValueError(f"Unrecognized date format: '{input_str}'")
+    # Anything else: day-first like the EU formats we accepted before, e.g. 01/07/2025, 1 Jul 2025.
+    # dateutil fills missing parts from `default`, so a partial date ("2024", "July", "March 2025")
+    # parses differently against two defaults and is rejected like before.
+    try:
+        parsed = date_parser.parse(input_str, dayfirst=True, default=_DATE_DEFAULTS[0])
+        if date_parser.parse(input_str, dayfirst=True, default=_DATE_DEFAULTS[1]) != parsed:
+            raise ValueError(input_str)
+        return _iso(parsed)
+    except (ValueError, OverflowError):
+        raise ValueError(f"Unrecognized date format: '{input_str}'")
 
 
-def find_existing_issue(jira: JIRA, project_key: str) -> Optional[str]:
+def find_existing_issue(jira: "JIRA", project_key: str) -> Optional[str]:
     """
     Tries to find an existing issue in the form PROJECT_KEY-1 through PROJECT_KEY-5.
 
@@ -201,17 +464,27 @@ def find_existing_issue(jira: JIRA, project_key: str) -> Optional[str]:
     Returns:
     - The first valid issue key found (e.g., 'DELPROJ-2'), or None if none exist.
     """
-    for i in range(1, 6):
-        issue_key = f"{project_key}-{i}"
-        try:
-            jira.issue(issue_key)
-            return issue_key
-        except Exception:
-            time.sleep(0.1)  # 100ms pause
+    # A single search instead of up to five GETs. `key in (...)` is not used because
+    # JQL rejects the whole query if any listed key does not exist.
+    candidates = {f"{project_key}-{i}" for i in range(1, 6)}
+    try:
+        response = jira.enhanced_search_issues(
+            jql_str=f"project = {_jql_quote(project_key)} ORDER BY key ASC",
+            maxResults=5,
+            fields=["key"],
+            json_result=True
+        )
+    except Exception:
+        return None
+
+    for issue in response.get("issues", []):
+        if issue.get("key") in candidates:
+            return issue["key"]
 
     return None
 
 
+@_ttl_cache(300)
 def get_all_jira_statuses() -> List[str]:
     """
     Fetches all available Jira statuses.
@@ -220,13 +493,22 @@ def get_all_jira_statuses() -> List[str]:
         A list of status names (e.g. ['Open', 'In Progress', 'Resolved', 'Closed'])
     """
     try:
-        statuses = jira.statuses()
+        statuses = get_jira().statuses()
         return [s.name for s in statuses]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch Jira statuses: {e}")
 
 
 
+@_ttl_cache(3600)
+def _issue_types_for_project(project_key: str) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """(issue type name, status names) pairs for a project; workflows change rarely."""
+    return tuple(
+        (issue_type.name, tuple(status.name for status in getattr(issue_type, "statuses", [])))
+        for issue_type in get_jira().issue_types_for_project(project_key)
+    )
+
+
 def _resolve_types_and_statuses(
     project_key: Optional[str] = None,
     project_names: Optional[List[str]] = None,
@@ -263,10 +545,9 @@ def _resolve_types_and_statuses(
     status_set = set()
 
     for key in keys:
-        for issue_type in jira.issue_types_for_project(key):
-            issue_type_set.add(issue_type.name)
-            for status in getattr(issue_type, "statuses", []):
-                status_set.add(status.name)
+        for issue_type_name, statuses in _issue_types_for_project(key):
+            issue_type_set.add(issue_type_name)
+            status_set.update(statuses)
 
     return {
         "available_issue_types": sorted(issue_type_set),
@@ -276,6 +557,7 @@ def _resolve_types_and_statuses(
 
 
 
+@_ttl_cache(300)
 def _get_all_jira_priorities() -> list[str]:
     """
     Fetches all available Jira priorities.
@@ -283,80 +565,282 @@ def _get_all_jira_priorities() -> list[str]:
         A list of priority names (e.g. ['Highest', 'High', 'Medium', 'Low', 'Lowest'])
     """
     try:
-        priorities = jira.priorities()
+        priorities = get_jira().priorities()
         return [p.name for p in priorities]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch Jira priorities: {e}")
     
+@_ttl_cache(300)
+def _fetch_all_projects() -> List[Dict[str, Optional[str]]]:
+    """All projects visible to the current user as {key, name, category} (category None if unset)."""
+    projects = get_jira().projects()
+    all_projects = []
+
+    for p in projects:
+        category = getattr(p, 'projectCategory', None)
+        all_projects.append({
+            "key": p.key,
+            "name": p.name,
+            "category": getattr(category, 'name', '') if category else None
+        })
+
+    return all_projects
+
+
+@_ttl_cache(300)
+def _fetch_filtered_projects() -> list[dict]:
+    """Projects visible to the current user, filtered by EXCLUDED_KEYS and DEFAULT_CATEGORY."""
+    projects = _fetch_all_projects()
+
+    # Category filter is a module constant: pick the loop once instead of per project
+    if DEFAULT_CATEGORY:
+        filtered_projects = [
+            dict(p) for p in projects
+            if p["key"] not in EXCLUDED_KEYS and p["category"] == DEFAULT_CATEGORY
+        ]
+    else:
+        filtered_projects = [dict(p) for p in projects if p["key"] not in EXCLUDED_KEYS]
+
+    return filtered_projects
+
+
 def _list_projects() -> list[dict]:
     """
     List Jira projects visible to the current user.
 
     """
     try:
-        projects = jira.projects()
-        filtered_projects = []
-
-        for p in projects:
-            # Exclude if key is in EXCLUDED_KEYS
-            if p.key in EXCLUDED_KEYS:
-                continue
-
-            # Filter by category if specified
-            category = getattr(p, 'projectCategory', None)
-            if DEFAULT_CATEGORY:
-                if category and getattr(category, 'name', '') == DEFAULT_CATEGORY:
-                    filtered_projects.append({
-                        "key": p.key,
-                        "name": p.name,
-                        "category": category.name
-                    })
-            else:
-                filtered_projects.append({
-                    "key": p.key,
-                    "name": p.name,
-                    "category": getattr(category, 'name', '') if category else None
-                })
-
-        return filtered_projects
+        return _fetch_filtered_projects()
     except Exception as e:
         return [{"error": str(e)}]
 
 
-def _generate_jql_from_input(
-    user_input: str,
-    category_filter: Optional[str] = os.getenv("DEFAULT_PROJECT_CATEGORY"),
-    exclude_projects: Optional[List[str]] = os.getenv("EXCLUDED_PROJECT_KEYS", "").split(",")
-) -> dict:
+@_ttl_cache(600)
+def _build_project_context(
+    category_filter: str,
+    exclude_projects: Tuple[str, ...],
+) -> Tuple[Tuple[Tuple[str, str], ...], str, Tuple[str, ...]]:
     """
-    Converts natural language input into JQL using Claude and estimates the result size.
-
-    Args:
-        user_input: Free-form user query like "all high priority tickets for Erste".
-        category_filter: Optional Jira project category to include only certain projects.
-        exclude_projects: Optional list of project keys to exclude.
+    Build the project/priority context used by the NL → JQL prompt.
+    Memoized per (category_filter, exclude_projects) for 10 minutes.
 
     Returns:
-        dict with 'jql', 'approx_query_results', and 'comment'.
+        (allowed_projects as (key, name) pairs, project_map_str, allowed_priorities)
     """
-    all_projects = _list_projects()
+    # Projects and priorities are independent round trips; fetch them concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        projects_future = executor.submit(_list_projects)
+        priorities_future = executor.submit(_get_all_jira_priorities)
+        all_projects = projects_future.result()
+        allowed_priorities = tuple(priorities_future.result())
+
+    if all_projects and "error" in all_projects[0]:
+        raise ValueError(f"Failed to list projects: {all_projects[0]['error']}")
 
     # Filter by category if provided
     if category_filter:
-        all_projects = [p for p in all_projects if p.get("category", "").lower() == category_filter.lower()]
+        wanted = category_filter.lower()
+        all_projects = [p for p in all_projects if (p.get("category") or "").lower() == wanted]
 
     # Filter out excluded projects
-    exclude_projects = [p.strip() for p in (exclude_projects or []) if p.strip()]
-    allowed_projects = [p for p in all_projects if p["key"] not in exclude_projects]
+    exclude_set = frozenset(exclude_projects)
+    allowed_projects = [p for p in all_projects if p["key"] not in exclude_set]
 
     if not allowed_projects:
         raise ValueError("No allowed projects after applying filters.")
 
-    allowed_project_keys = [p["key"] for p in allowed_projects]
-    allowed_priorities = _get_all_jira_priorities()
+    allowed_project_pairs = tuple((p["key"], p["name"]) for p in allowed_projects)
+    project_map_str = "\n".join(f"{p['key']}: {p['name']}" for p in allowed_projects)
+
+    return allowed_project_pairs, project_map_str, allowed_priorities
+
+
+# Deterministic fast path for the common "<open> tickets from the past N <unit>" queries,
+# so they skip the LLM round trip entirely. Units follow the same conversions as the prompt.
+_FAST_PATH_RE = re.compile(
+    r"(?:show\s+(?:me\s+)?)?(?:all\s+)?(?P<open>open|unresolved)?\s*(?:jira\s+)?(?:tickets?|issues?)\s+"
+    r"(?:created\s+)?(?:from|in|since)\s+(?:the\s+)?(?:past|last)\s+(?:(?P<n>\d+)\s+)?"
+    r"(?P<unit>days?|weeks?|months?|quarters?|years?)",
+    re.IGNORECASE,
+)
+_FAST_PATH_UNITS = {"day": (1, "d"), "week": (1, "w"), "month": (30, "d"), "quarter": (90, "d"), "year": (365, "d")}
+_FAST_PATH_STATS = {"hits": 0, "misses": 0}
+_FAST_PATH_STATS_LOCK = threading.Lock()  # called from asyncio.to_thread workers
+
+
+def _fast_path_jql(user_input: str) -> Optional[Dict[str, str]]:
+    """Return {'jql', 'comment'} for trivially structured inputs, or None to fall back to the LLM."""
+    match = _FAST_PATH_RE.fullmatch(user_input.strip().rstrip(".?!").strip())
+    if not match:
+        with _FAST_PATH_STATS_LOCK:
+            _FAST_PATH_STATS["misses"] += 1
+        return None
+
+    with _FAST_PATH_STATS_LOCK:
+        _FAST_PATH_STATS["hits"] += 1
+        hits, total = _FAST_PATH_STATS["hits"], _FAST_PATH_STATS["hits"] + _FAST_PATH_STATS["misses"]
+    logger.info("JQL fast path hit rate: %d/%d", hits, total)
+
+    n = int(match.group("n") or 1)
+    unit = match.group("unit").lower().rstrip("s")
+    factor, suffix = _FAST_PATH_UNITS[unit]
+
+    clauses = [f"created >= -{n * factor}{suffix}"]
+    comments = []
+    if factor > 1:
+        comments.append(f"Converted {n} {unit}{'s' if n != 1 else ''} into {n * factor} days.")
+    if match.group("open"):
+        clauses.append("resolution in (Unresolved, EMPTY)")
+        if match.group("open").lower() == "open":
+            comments.append("Assumed 'open' means unresolved.")
+
+    return {
+        "jql": " AND ".join(clauses),
+        "comment": " ".join(comments) or "Matched a standard date-range query.",
+    }
+
+
+# Rule-based fast path for "<open|resolved> <priority> tickets for <project>" style queries.
+# Every word must be understood, otherwise the LLM handles the request.
+_RULE_NON_WORD_RE = re.compile(r"[^\w\s-]+")
+_RULE_STOPWORDS = frozenset({
+    "all", "any", "show", "me", "list", "get", "find", "the", "a", "and", "jira",
+    "ticket", "tickets", "issue", "issues", "for", "in", "of", "on", "from", "with",
+    "priority", "prio", "project",
+})
+_RULE_RESOLUTION = {
+    "open": "resolution in (Unresolved, EMPTY)",
+    "unresolved": "resolution in (Unresolved, EMPTY)",
+    "resolved": "resolution NOT IN (Unresolved, EMPTY)",
+    "closed": "resolution NOT IN (Unresolved, EMPTY)",
+}
+
+
+def _rule_based_jql(
+    user_input: str,
+    allowed_projects: Tuple[Tuple[str, str], ...],
+    allowed_priorities: Tuple[str, ...],
+) -> Optional[Dict[str, str]]:
+    """Translate simple project/priority/resolution requests to JQL, or return None."""
+    text = f" {_RULE_NON_WORD_RE.sub(' ', user_input.lower())} "
+
+    # Project first, against the whole phrase: priority and resolution words can be part
+    # of a project name ("High Street Bank"). Longest names first.
+    project_key = None
+    for key, name in sorted(allowed_projects, key=lambda p: len(p[1]), reverse=True):
+        needle = next((n for n in (f" {name.lower()} ", f" {key.lower()} ") if n in text), None)
+        if needle:
+            project_key = key
+            text = text.replace(needle, " ")
+            break
+
+    # Priorities may span several words ("P1 - Critical"); match longest names first
+    priorities = []
+    for name in sorted(allowed_priorities, key=len, reverse=True):
+        needle = f" {name.lower()} "
+        if needle in text:
+            priorities.append(name)
+            text = text.replace(needle, " ")
+
+    resolutions = set()
+    resolution_words = []
+    remaining = []
+    for token in text.split():
+        if token in _RULE_STOPWORDS:
+            continue
+        if token in _RULE_RESOLUTION:
+            resolutions.add(_RULE_RESOLUTION[token])
+            resolution_words.append(token)
+        else:
+            remaining.append(token)
+
+    if len(resolutions) > 1:
+        return None
+
+    if remaining:
+        if project_key:
+            return None  # words left over next to a project we already matched
+        # Fuzzy project match (typos) on what is left
+        phrase = " ".join(remaining)
+        by_key = {key.lower(): key for key, _ in allowed_projects}
+        by_name = {name.lower(): key for key, name in allowed_projects}
+        if phrase in by_key:
+            project_key = by_key[phrase]
+        else:
+            hits = get_close_matches(phrase, list(by_name), n=1, cutoff=0.8)
+            if not hits:
+                return None
+            project_key = by_name[hits[0]]
+        # A word taken as priority/resolution may have belonged to the project instead
+        project_words = {
+            w for key, name in allowed_projects if key == project_key for w in f"{key} {name}".lower().split()
+        }
+        taken = {w for p in priorities for w in p.lower().split()} | set(resolution_words)
+        if taken & project_words:
+            return None
+
+    clauses = [
+        f"project = {project_key}" if project_key else "",
+        _jql_in_clause("priority", priorities),
+        *resolutions,
+    ]
+    clauses = [c for c in clauses if c]
+    if not clauses:
+        return None
+
+    return {
+        "jql": " AND ".join(clauses),
+        "comment": "Resolved project/priority/resolution filters directly from the request.",
+    }
+
+
+_PROJECT_SHORTLIST_SIZE = 25
+
+
+def _shortlist_projects(
+    query: str,
+    projects: Tuple[Tuple[str, str], ...],
+    limit: int = _PROJECT_SHORTLIST_SIZE,
+) -> List[Tuple[str, str]]:
+    """
+    Pick the (key, name) pairs most likely referenced by `query` so LLM prompts stay small.
+    Small instances are returned unchanged; with no plausible match the first `limit` are used.
+    """
+    if len(projects) <= limit:
+        return list(projects)
 
-    project_map_str = "\n".join([f"{p['key']}: {p['name']}" for p in allowed_projects])
+    text = _RULE_NON_WORD_RE.sub(" ", query.lower())
+    words = [w for w in text.split() if len(w) >= 3 and w not in _RULE_STOPWORDS]
 
+    # Word-level index so "unicredt" still finds "Unicredit Italy"
+    word_index: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+    for key, name in projects:
+        word_index[key.lower()].append((key, name))
+        for w in name.lower().split():
+            word_index[w].append((key, name))
+    index_words = list(word_index)
+
+    picked: Dict[str, Tuple[str, str]] = {}
+    for w in words:
+        for hit in get_close_matches(w, index_words, n=3, cutoff=0.8):
+            for project in word_index[hit]:
+                picked.setdefault(project[0], project)
+
+    by_name = {name.lower(): (key, name) for key, name in projects}
+    for hit in get_close_matches(text.strip(), list(by_name), n=limit, cutoff=0.3):
+        picked.setdefault(by_name[hit][0], by_name[hit])
+
+    if not picked:
+        return list(projects[:limit])
+    return list(picked.values())[:limit]
+
+
+@_ttl_cache(600)
+def _llm_generate_jql(user_input: str, category_filter: str, exclude_tuple: Tuple[str, ...]) -> Tuple[str, str]:
+    """
+    Ask the LLM for (jql, comment). Memoized per (input, category, excluded keys) so a
+    repeated question skips the Bedrock round trip; invalidate_cache() drops it.
+    """
     system_prompt = (
         "You are a Jira assistant that converts natural language requests into structured JSON "
         "for querying Jira issues.\n\n"
@@ -397,7 +881,11 @@ def _generate_jql_from_input(
         "  → { \"jql\": \"project = ASPFI AND created >= -14d\", \"comment\": \"Assumed 'recent' means last 2 weeks.\" }\n"
     )
 
+    allowed_projects, project_map_str, allowed_priorities = _build_project_context(category_filter, exclude_tuple)
 
+    # Only send the projects the query plausibly refers to on large instances
+    if len(allowed_projects) > _PROJECT_SHORTLIST_SIZE:
+        project_map_str = "\n".join(f"{key}: {name}" for key, name in _shortlist_projects(user_input, allowed_projects))
 
     user_prompt = f"""User Query:
     {user_input}
@@ -412,15 +900,15 @@ def _generate_jql_from_input(
     {_resolve_types_and_statuses()}
     """
 
-    full_response = call_nova_lite(system_prompt + "\n" + user_prompt)
+    full_response = call_nova_lite("\n".join((system_prompt, user_prompt)))
 
     try:
         # Find the first valid JSON object using a non-greedy match
-        match = re.search(r'\{.*?\}', full_response, re.DOTALL)
+        match = _JSON_OBJ_RE.search(full_response)
         if not match:
             raise ValueError("No JSON object found in model response.")
         
-        result = json.loads(match.group(0))
+        result = _json_loads(match.group(0))
 
 
     except Exception as e:
@@ -430,6 +918,49 @@ def _generate_jql_from_input(
     generated_jql = result.get("jql", "").strip()
     comment = result.get("comment", "").strip() or "No comment provided."
 
+    return generated_jql, comment
+
+
+def _generate_jql_from_input(
+    user_input: str,
+    category_filter: Optional[str] = os.getenv("DEFAULT_PROJECT_CATEGORY"),
+    exclude_projects: Optional[List[str]] = os.getenv("EXCLUDED_PROJECT_KEYS", "").split(",")
+) -> dict:
+    """
+    Converts natural language input into JQL using Claude and estimates the result size.
+
+    Args:
+        user_input: Free-form user query like "all high priority tickets for Erste".
+        category_filter: Optional Jira project category to include only certain projects.
+        exclude_projects: Optional list of project keys to exclude.
+
+    Returns:
+        dict with 'jql', 'approx_query_results', and 'comment'.
+    """
+    fast = _fast_path_jql(user_input)
+    if fast:
+        approx = _approximate_jira_issue_count(fast["jql"])
+        return {
+            "jql": fast["jql"],
+            "approx_query_results": approx.get("approximate_count", -1),
+            "comment": fast["comment"],
+        }
+
+    exclude_tuple = tuple(sorted({p.strip() for p in (exclude_projects or []) if p.strip()}))
+    allowed_projects, project_map_str, allowed_priorities = _build_project_context(category_filter or "", exclude_tuple)
+
+    rule = _rule_based_jql(user_input, allowed_projects, allowed_priorities)
+    if rule:
+        approx = _approximate_jira_issue_count(rule["jql"])
+        return {
+            "jql": rule["jql"],
+            "approx_query_results": approx.get("approximate_count", -1),
+            "comment": rule["comment"],
+        }
+
+    # The LLM answer is cached per (query, project scope); the count is always live
+    generated_jql, comment = _llm_generate_jql(user_input, category_filter or "", exclude_tuple)
+
     approx = _approximate_jira_issue_count(generated_jql)
     approx_count = approx.get("approximate_count", -1)
 
@@ -445,9 +976,9 @@ def _generate_jql_from_input(
 @dataclass
 class ProjectData:
     total: int = 0
-    unresolved_by_priority: Counter = field(default_factory=Counter)
-    unresolved_by_status: Counter = field(default_factory=Counter)
-    unresolved_by_assignee: Counter = field(default_factory=Counter)
+    unresolved_by_priority: DefaultDict[str, int] = field(default_factory=lambda: defaultdict(int))
+    unresolved_by_status: DefaultDict[str, int] = field(default_factory=lambda: defaultdict(int))
+    unresolved_by_assignee: DefaultDict[str, int] = field(default_factory=lambda: defaultdict(int))
 
 
 def _summarize_jira_issues(jql: str) -> Dict:
@@ -465,54 +996,36 @@ def _summarize_jira_issues(jql: str) -> Dict:
     - top 5 projects with most unresolved
     """
     try:
-        all_issues = []
-        next_page_token = None
-        max_results = 100
-
-        # Fetch all issues
-        while True:
-            issues = jira.enhanced_search_issues(
-                jql_str=jql,
-                nextPageToken=next_page_token,
-                maxResults=max_results,
-                fields=["project", "status", "priority", "assignee", "resolution"],
-                use_post=True
-            )
-            if not issues:
-                break
-
-            all_issues.extend(issues)
-            next_page_token = getattr(issues, "nextPageToken", None)
-            if not next_page_token:
-                break
-
-        total_issues = len(all_issues)
-        unresolved_issues = [i for i in all_issues if not getattr(i.fields, "resolution", None)]
+        total_issues = 0
+        total_unresolved = 0
 
         # Global counters
-        global_unresolved_by_priority = Counter()
-        global_unresolved_by_status = Counter()
-        global_unresolved_by_assignee = Counter()
+        global_unresolved_by_priority = defaultdict(int)
+        global_unresolved_by_status = defaultdict(int)
+        global_unresolved_by_assignee = defaultdict(int)
 
         # Per-project structured data
         per_project_data: DefaultDict[str, ProjectData] = defaultdict(ProjectData)
 
-        # Count totals
-        for issue in all_issues:
-            project_key = getattr(issue.fields.project, "key", "UNKNOWN")
-            per_project_data[project_key].total += 1
+        # Aggregate page by page so only the counters outlive each response
+        for issue in _iter_jql_issues(jql, ["project", "status", "priority", "assignee", "resolution"]):
+            fields = issue.get("fields") or {}
+            project_key = (fields.get("project") or {}).get("key", "UNKNOWN")
+            data = per_project_data[project_key]
+            data.total += 1
+            total_issues += 1
+
+            if fields.get("resolution"):
+                continue
 
-        # Count unresolved
-        for issue in unresolved_issues:
-            fields = issue.fields
-            project_key = getattr(fields.project, "key", "UNKNOWN")
-            priority = getattr(fields.priority, "name", "None")
-            status = getattr(fields.status, "name", "Unknown")
-            assignee = getattr(fields.assignee, "displayName", "Unassigned")
+            total_unresolved += 1
+            priority = (fields.get("priority") or {}).get("name", "None")
+            status = (fields.get("status") or {}).get("name", "Unknown")
+            assignee = (fields.get("assignee") or {}).get("displayName", "Unassigned")
 
-            per_project_data[project_key].unresolved_by_priority[priority] += 1
-            per_project_data[project_key].unresolved_by_status[status] += 1
-            per_project_data[project_key].unresolved_by_assignee[assignee] += 1
+            data.unresolved_by_priority[priority] += 1
+            data.unresolved_by_status[status] += 1
+            data.unresolved_by_assignee[assignee] += 1
 
             global_unresolved_by_priority[priority] += 1
             global_unresolved_by_status[status] += 1
@@ -525,19 +1038,19 @@ def _summarize_jira_issues(jql: str) -> Dict:
             per_project_dict[project_key] = {
                 "total": data.total,
                 "unresolved_ratio": round(unresolved_total / data.total, 2) if data.total else 0,
-                "unresolved_by_priority": dict(data.unresolved_by_priority),
-                "unresolved_by_status": dict(data.unresolved_by_status),
-                "unresolved_by_assignee": dict(data.unresolved_by_assignee),
+                "unresolved_by_priority": data.unresolved_by_priority,
+                "unresolved_by_status": data.unresolved_by_status,
+                "unresolved_by_assignee": data.unresolved_by_assignee,
             }
 
         return {
             "total_issues": total_issues,
-            "total_unresolved_issues": len(unresolved_issues),
-            "unresolved_global_by_priority": dict(global_unresolved_by_priority),
-            "unresolved_global_by_status": dict(global_unresolved_by_status),
-            "unresolved_global_by_assignee": dict(global_unresolved_by_assignee),
+            "total_unresolved_issues": total_unresolved,
+            "unresolved_global_by_priority": global_unresolved_by_priority,
+            "unresolved_global_by_status": global_unresolved_by_status,
+            "unresolved_global_by_assignee": global_unresolved_by_assignee,
             "per_project": per_project_dict,
-            "generated_at": datetime.utcnow().replace(tzinfo=pytz.UTC).isoformat()
+            "generated_at": datetime.now(UTC).isoformat()
         }
 
     except Exception as e:
@@ -547,6 +1060,23 @@ def _summarize_jira_issues(jql: str) -> Dict:
 
 
 
+def _jql_result_row(issue: Dict) -> Dict:
+    """Flatten one raw search/jql issue into the row returned by _execute_jql_query."""
+    fields = issue.get("fields") or {}
+    return {
+        "key": issue.get("key"),
+        "summary": fields.get("summary"),
+        "issue_type": (fields.get("issuetype") or {}).get("name"),
+        "status": (fields.get("status") or {}).get("name"),
+        "assignee": (fields.get("assignee") or {}).get("displayName"),
+        "created": fields.get("created"),
+        "updated": fields.get("updated"),
+        "project": (fields.get("project") or {}).get("key"),
+        "resolution": (fields.get("resolution") or {}).get("name"),
+        "priority": (fields.get("priority") or {}).get("name"),
+    }
+
+
 def _execute_jql_query(jql: str) -> List[Dict]:
     """
     Executes a JQL query and returns all matching issues using Jira Cloud's enhanced search with pagination.
@@ -564,43 +1094,14 @@ def _execute_jql_query(jql: str) -> List[Dict]:
     - priority
     """
     try:
-        all_issues = []
-        next_page_token = None
-
-        while True:
-            response = jira.enhanced_search_issues(
-                jql_str=jql,
-                nextPageToken=next_page_token,
-                maxResults=100,
-                fields=[
-                    "summary", "issuetype", "status", "assignee",
-                    "created", "updated", "project", "resolution", "priority"
-                ],
-                use_post=True,
-                json_result=False
-            )
-
-            for issue in response:
-                fields = issue.fields
-                all_issues.append({
-                    "key": issue.key,
-                    "summary": getattr(fields, "summary", None),
-                    "issue_type": getattr(getattr(fields, "issuetype", None), "name", None),
-                    "status": getattr(getattr(fields, "status", None), "name", None),
-                    "assignee": getattr(getattr(fields, "assignee", None), "displayName", None),
-                    "created": getattr(fields, "created", None),
-                    "updated": getattr(fields, "updated", None),
-                    "project": getattr(getattr(fields, "project", None), "key", None),
-                    "resolution": getattr(getattr(fields, "resolution", None), "name", None),
-                    "priority": getattr(getattr(fields, "priority", None), "name", None),
-                })
-
-            # Pagination check
-            next_page_token = getattr(response, "nextPageToken", None)
-            if not next_page_token:
-                break
-
-        return all_issues
+        issue_fields = [
+            "summary", "issuetype", "status", "assignee",
+            "created", "updated", "project", "resolution", "priority"
+        ]
+        return [
+            _jql_result_row(issue)
+            for issue in _iter_jql_issues(jql, issue_fields)
+        ]
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to execute JQL: {e}")
@@ -620,16 +1121,10 @@ def _resolve_project_name(human_input: str, category_filter: Optional[str] = Non
         A list of up to 5 dicts like [{'key': 'UCB', 'name': 'Unicredit Italy'}, ...]
     """
     try:
-        projects = jira.projects()
-        all_projects = []
-
-        for p in projects:
-            category = getattr(p, 'projectCategory', None)
-            all_projects.append({
-                "key": p.key,
-                "name": p.name,
-                "category": getattr(category, 'name', '') if category else ''
-            })
+        all_projects = [
+            {**p, "category": p["category"] or ""}
+            for p in _fetch_all_projects()
+        ]
     except Exception as e:
         raise RuntimeError(f"Failed to fetch Jira projects: {e}")
 
@@ -645,6 +1140,18 @@ def _resolve_project_name(human_input: str, category_filter: Optional[str] = Non
     if not filtered_projects:
         raise ValueError(f"No projects found in category '{category_filter}'.")
 
+    # Fast path: exact key or (near-)exact name needs no LLM call
+    query = human_input.strip().lower()
+    by_key = {p["key"].lower(): p for p in filtered_projects}
+    if query in by_key:
+        return [by_key[query]]
+
+    # Normalized name index, shared by the fast path and the LLM result mapping
+    by_name = {p["name"].strip().lower(): p for p in filtered_projects}
+    hits = get_close_matches(query, list(by_name), n=5, cutoff=0.85)
+    if hits:
+        return [by_name[name] for name in hits]
+
     system_prompt = (
         "You are a Jira assistant helping users match human-friendly descriptions to existing Jira project names.\n\n"
         "RULES:\n"
@@ -653,7 +1160,9 @@ def _resolve_project_name(human_input: str, category_filter: Optional[str] = Non
         "- Do NOT return any explanations or markdown.\n"
     )
 
-    formatted_projects = "\n".join(f"- {p['name']}" for p in filtered_projects)
+    # Keep the prompt small on large instances
+    shortlist = _shortlist_projects(human_input, tuple((p["key"], p["name"]) for p in filtered_projects))
+    formatted_projects = "\n".join(f"- {name}" for _, name in shortlist)
 
     user_message = f"""
     User input:
@@ -669,23 +1178,39 @@ def _resolve_project_name(human_input: str, category_filter: Optional[str] = Non
     response = call_nova_lite(system_prompt + "\n\n" + user_message).strip()
 
     try:
-        match = re.search(r"\[.*?\]", response, re.DOTALL)
+        match = _JSON_ARR_RE.search(response)
         json_str = match.group(0) if match else response
-        selected_names = json.loads(json_str)
+        selected_names = _json_loads(json_str)
     except Exception as e:
         raise ValueError(f"❌ Failed to parse Nova's response: {e}\n\nRaw response:\n{response}")
 
     if not isinstance(selected_names, list) or not all(isinstance(n, str) for n in selected_names):
         raise ValueError(f"❌ Unexpected format returned from Nova: {selected_names}")
 
-    # Match names back to project dicts
-    name_to_project = {p['name']: p for p in filtered_projects}
-    selected_projects = [name_to_project[name] for name in selected_names if name in name_to_project]
+    # Match names back to project dicts, tolerating casing/whitespace differences
+    normalized = (name.strip().lower() for name in selected_names)
+    selected_projects = [by_name[name] for name in normalized if name in by_name]
 
     return selected_projects[:5]
 
 
 
+def _jql_quote(value: str) -> str:
+    """Quote a value as a JQL string literal, escaping backslashes and double quotes."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _jql_in_clause(field: str, values: Optional[List[str]]) -> str:
+    """Build `field IN ("a", "b")` from non-empty values, or return "" when there are none."""
+    quoted = [_jql_quote(v) for v in values or [] if v]
+    return f"{field} IN ({', '.join(quoted)})" if quoted else ""
+
+
+# Multi-value filters of _advanced_search_issues, in the order of its list parameters
+_IN_FIELDS = ("project", "priority")
+_SORT_ORDERS = frozenset({"ASC", "DESC"})
+
+
 def _advanced_search_issues(
     projects: list[str] = [],
     priorities: list[str] = [],
@@ -699,15 +1224,10 @@ def _advanced_search_issues(
     Search Jira issues using enhanced_search_issues and simplified filters.
     Returns a list of dictionaries with extracted issue fields.
     """
-    jql_parts = []
-
-    if projects:
-        quoted_projects = [f'"{p}"' for p in projects]
-        jql_parts.append(f'project IN ({", ".join(quoted_projects)})')
-
-    if priorities:
-        quoted_priorities = [f'"{p}"' for p in priorities]
-        jql_parts.append(f'priority IN ({", ".join(quoted_priorities)})')
+    jql_parts = [
+        _jql_in_clause(field, values)
+        for field, values in zip(_IN_FIELDS, (projects, priorities))
+    ]
 
     if resolved is True:
         jql_parts.append('resolution NOT IN (EMPTY, Unresolved)')
@@ -715,76 +1235,170 @@ def _advanced_search_issues(
         jql_parts.append('resolution IN (EMPTY, Unresolved)')
 
     if created_after:
-        jql_parts.append(f'created >= "{created_after}"')
+        jql_parts.append(f"created >= {_jql_quote(created_after)}")
 
     if updated_after:
-        jql_parts.append(f'updated >= "{updated_after}"')
+        jql_parts.append(f"updated >= {_jql_quote(updated_after)}")
 
     sort_order = sort_order.upper()
-    if sort_order not in ("ASC", "DESC"):
+    if sort_order not in _SORT_ORDERS:
         sort_order = "DESC"
 
-    jql = " AND ".join(jql_parts)
+    jql = " AND ".join(part for part in jql_parts if part)
     if sort_by:
         jql += f" ORDER BY {sort_by} {sort_order}"
 
     try:
-        response = jira.enhanced_search_issues(
+        response = get_jira().enhanced_search_issues(
             jql_str=jql,
             fields=[
                 "summary", "issuetype", "status", "assignee", "reporter",
                 "created", "updated", "project", "resolution", "priority"
             ],
             use_post=True,
-            json_result=False
+            json_result=True
         )
-        return [_extract_issue_fields(issue) for issue in response]
+        return [_issue_fields_from_json(issue) for issue in response.get("issues", [])]
 
     except Exception as e:
         return [{"error": str(e), "jql": jql}]
 
 
-def _get_tickets_insights(ticket_keys: List[str]) -> Dict:
-    import textwrap
-    import json
-    import re
+_TICKET_TEMPLATE = (
+    "Ticket %s:\n"
+    "Summary: %s\n"
+    "Status: %s\n"
+    "Priority: %s\n"
+    "Assignee: %s\n"
+    "Created: %s\n"
+    "Updated: %s\n"
+    "\n"
+    "Description:\n"
+    "%s\n"
+    "\n"
+    "Comments:\n"
+    "%s"
+)
+
+
+def _fetch_ticket_data(key: str) -> Dict:
+    """Fetch one ticket with description and comments for the insights prompt."""
+    issue = get_jira().issue(key, fields=f"{_ISSUE_FIELDS},description,comment")
+    data = _extract_issue_fields(issue)
+    data["description"] = getattr(issue.fields, "description", None) or ""
+    data["comments"] = get_clean_comments_from_issue(get_jira(), issue)
+    return data
 
-    summaries = {}
-    extracted_data = {}
 
-    # Step 1: Extract fields from all issues first
-    for key in ticket_keys:
-        try:
-            extracted_data[key] = _extract_issue_fields(
-                jira.issue(key)
-            )
-        except Exception as e:
-            summaries[key] = f"❌ Error fetching ticket data: {e}"
-
-    # Step 2: Build full user input for all tickets
-    all_ticket_inputs = []
-    for key, data in extracted_data.items():
-        comment_text = "\n".join(f"{c['author']}: {c['body']}" for c in data.get("comments", []))
+def _ticket_data_from_json(issue: Dict) -> Dict:
+    """Same shape as _fetch_ticket_data, built from a raw search/jql issue."""
+    fields = issue.get("fields") or {}
+    comment_field = fields.get("comment") or {}
+    data = _issue_fields_from_json(issue)
+    data["description"] = fields.get("description") or ""
+    data["comments"] = [
+        {
+            "author": (c.get("author") or {}).get("displayName"),
+            "created": c.get("created"),
+            "text": c.get("body"),
+        }
+        for c in comment_field.get("comments") or []
+    ]
+    data["_comment_total"] = comment_field.get("total", 0)
+    return data
 
-        ticket_input = textwrap.dedent(f"""
-            Ticket {key}:
-            Summary: {data.get('summary')}
-            Status: {data.get('status')}
-            Priority: {data.get('priority')}
-            Assignee: {data.get('assignee')}
-            Created: {data.get('created')}
-            Updated: {data.get('updated')}
 
-            Description:
-            {data.get('description', '')}
+def _fetch_tickets_batch(ticket_keys: List[str]) -> Dict[str, Dict]:
+    """
+    Fetch all tickets with one `key IN (...)` search instead of one request per key.
+    Jira embeds the first page of comments; only tickets with more than that are
+    re-fetched through jira.comments, in parallel. Keys Jira did not return are absent;
+    returned keys are upper-cased.
+    """
+    keys = [k for k in ticket_keys if k]
+    jql = _jql_in_clause("key", keys)
+    if not jql:
+        return {}  # no keys: never run an unbounded search
+    by_key: Dict[str, Dict] = {}
+    fields = [*_ISSUE_FIELDS.split(","), "description", "comment"]
+    for issue in _iter_jql_issues(jql, fields, len(keys)):
+        data = _ticket_data_from_json(issue)
+        by_key[data["key"].upper()] = data
+
+    truncated = [k for k, d in by_key.items() if d.pop("_comment_total") > len(d["comments"])]
+    if truncated:
+        def fetch_comments(key: str) -> list:
+            try:
+                return [
+                    {"author": c.author.displayName, "created": c.created, "text": c.body}
+                    for c in get_jira().comments(key)
+                ]
+            except Exception as e:
+                return [{"error": str(e)}]
+
+        with ThreadPoolExecutor(max_workers=JIRA_MAX_WORKERS) as executor:
+            for key, comments in zip(truncated, executor.map(fetch_comments, truncated)):
+                by_key[key]["comments"] = comments
+
+    return by_key
 
-            Comments:
-            {comment_text}
-        """).strip()
 
-        all_ticket_inputs.append(ticket_input)
+def _get_tickets_insights(ticket_keys: List[str]) -> Dict:
+    summaries = {}
+    extracted_data = {}
 
-    full_input = "\n\n".join(all_ticket_inputs)
+    # Step 1: One batched search for every ticket; if Jira rejects it (e.g. a key
+    # that does not exist), fall back to concurrent per-key fetches so each key
+    # gets its own error as before.
+    try:
+        batch = _fetch_tickets_batch(ticket_keys) if ticket_keys else {}
+    except Exception:
+        batch = None
+
+    if batch is not None:
+        for key in ticket_keys:
+            data = batch.get(key.strip().upper())
+            if data is not None:
+                extracted_data[key] = data
+            else:
+                summaries[key] = "❌ Error fetching ticket data: issue not found or not visible"
+    else:
+        def fetch_one(key: str):
+            try:
+                return key, _fetch_ticket_data(key), None
+            except Exception as e:
+                return key, None, e
+
+        with ThreadPoolExecutor(max_workers=JIRA_MAX_WORKERS) as executor:
+            for key, data, error in executor.map(fetch_one, ticket_keys):
+                if error is None:
+                    extracted_data[key] = data
+                else:
+                    summaries[key] = f"❌ Error fetching ticket data: {error}"
+
+    # Step 2: Stream every ticket into one buffer instead of a list of large strings
+    buf = io.StringIO()
+    for key, data in extracted_data.items():
+        comment_text = "\n".join(
+            f"{c.get('author')}: {c.get('text', '')}"
+            for c in data.get("comments", [])
+            if "error" not in c
+        )
+        if buf.tell():
+            buf.write("\n\n")
+        buf.write((_TICKET_TEMPLATE % (
+            key,
+            data.get("summary"),
+            data.get("status"),
+            data.get("priority"),
+            data.get("assignee"),
+            data.get("created"),
+            data.get("updated"),
+            data.get("description", ""),
+            comment_text,
+        )).strip())
+
+    full_input = buf.getvalue()
 
     system_prompt = (
         "You are a senior Jira analyst. The user will give you raw ticket data for multiple tickets.\n\n"
@@ -811,16 +1425,15 @@ def _get_tickets_insights(ticket_keys: List[str]) -> Dict:
     user_input = f"Here is the data for the following tickets:\n\n{full_input}"
 
     try:
-        response = call_nova_lite(system_prompt + "\n\nUser Input:\n" + user_input)
+        response = call_nova_lite(f"{system_prompt}\n\nUser Input:\n{user_input}")
         print(f"\n🔍 LLM raw response:\n{response}\n")
 
         try:
-            summaries = json.loads(response)
+            summaries = _json_loads(response)
         except json.JSONDecodeError:
-            match = re.search(r"\{(?:[^{}]|(?R))*\}", response, re.DOTALL)
-            if match:
-                partial = match.group(0)
-                summaries = json.loads(partial)
+            parsed = _extract_json_object(response)
+            if parsed is not None:
+                summaries = parsed
             else:
                 for key in extracted_data.keys():
                     summaries[key] = f"❌ Failed to parse response:\n{response}"
@@ -831,6 +1444,9 @@ def _get_tickets_insights(ticket_keys: List[str]) -> Dict:
     return summaries
 
 
+# created / resolutiondate as Jira returns them, e.g. 2024-01-05T10:20:30.123+0100
+_JIRA_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
+
 
 def _summarize_and_analyze_jql(jql: str) -> Dict:
     """
@@ -850,48 +1466,30 @@ def _summarize_and_analyze_jql(jql: str) -> Dict:
             "project_name": "",
             "total": 0,
             "unresolved": 0,
-            "by_priority": Counter(),
-            "by_status": Counter(),
-            "by_assignee": Counter(),
-            "incident_sla_count_by_priority": Counter(),
+            "by_priority": defaultdict(int),
+            "by_status": defaultdict(int),
+            "by_assignee": defaultdict(int),
+            "incident_sla_count_by_priority": defaultdict(int),
             "incident_sla_resolution_by_priority": defaultdict(list)
         })
 
-        all_issues: List[Any] = []
-        next_page_token = None
-        max_results = 100
-
-        while True:
-            issues = jira.enhanced_search_issues(
-                jql_str=jql,
-                nextPageToken=next_page_token,
-                maxResults=max_results,
-                fields=[
-                    "project", "priority", "issuetype", "created",
-                    "resolutiondate", "status", "assignee", "resolution"
-                ],
-                use_post=True
-            )
-
-            if not issues:
-                break
-
-            all_issues.extend(issues)
-            next_page_token = getattr(issues, "nextPageToken", None)
-            if not next_page_token:
-                break
-
-        for issue in all_issues:
-            fields = issue.fields
-            project_key = getattr(fields.project, "key", "UNKNOWN")
-            project_name = getattr(fields.project, "name", "Unknown Project")
-            priority = getattr(fields.priority, "name", "None")
-            issue_type = getattr(fields.issuetype, "name", "Unknown")
-            status = getattr(fields.status, "name", "Unknown")
-            assignee = getattr(fields.assignee, "displayName", "Unassigned")
-            created = getattr(fields, "created", None)
-            resolved = getattr(fields, "resolutiondate", None)
-            resolution = getattr(fields, "resolution", None)
+        # Aggregate page by page instead of holding every issue in memory
+        sla_fields = [
+            "project", "priority", "issuetype", "created",
+            "resolutiondate", "status", "assignee", "resolution"
+        ]
+        for issue in _iter_jql_issues(jql, sla_fields):
+            fields = issue.get("fields") or {}
+            project = fields.get("project") or {}
+            project_key = project.get("key", "UNKNOWN")
+            project_name = project.get("name", "Unknown Project")
+            priority = (fields.get("priority") or {}).get("name", "None")
+            issue_type = (fields.get("issuetype") or {}).get("name", "Unknown")
+            status = (fields.get("status") or {}).get("name", "Unknown")
+            assignee = (fields.get("assignee") or {}).get("displayName", "Unassigned")
+            created = fields.get("created")
+            resolved = fields.get("resolutiondate")
+            resolution = fields.get("resolution")
 
             data = per_project_data[project_key]
             data["project_name"] = project_name
@@ -910,12 +1508,13 @@ def _summarize_and_analyze_jql(jql: str) -> Dict:
                 data["incident_sla_count_by_priority"][priority] += 1
                 if created and resolved:
                     try:
-                        created_dt = datetime.strptime(created[:19], "%Y-%m-%dT%H:%M:%S")
-                        resolved_dt = datetime.strptime(resolved[:19], "%Y-%m-%dT%H:%M:%S")
-                        days_to_resolve = (resolved_dt - created_dt).total_seconds() / 86400
-                        data["incident_sla_resolution_by_priority"][priority].append(days_to_resolve)
-                    except Exception:
-                        pass
+                        # strptime, not fromisoformat: the colon-less offset needs Python 3.11 there
+                        created_dt = datetime.strptime(created, _JIRA_TIMESTAMP_FORMAT)
+                        resolved_dt = datetime.strptime(resolved, _JIRA_TIMESTAMP_FORMAT)
+                    except ValueError:
+                        continue
+                    days_to_resolve = (resolved_dt - created_dt).total_seconds() / 86400.0
+                    data["incident_sla_resolution_by_priority"][priority].append(days_to_resolve)
 
         # Convert results into plain dicts
         simplified_output: Dict[str, Any] = {}
@@ -924,10 +1523,10 @@ def _summarize_and_analyze_jql(jql: str) -> Dict:
                 "project_name": data["project_name"],
                 "total_issues": data["total"],
                 "unresolved_issues": data["unresolved"],
-                "by_priority": dict(data["by_priority"]),
-                "by_status": dict(data["by_status"]),
-                "by_assignee": dict(data["by_assignee"]),
-                "incident_sla_count_by_priority": dict(data["incident_sla_count_by_priority"]),
+                "by_priority": data["by_priority"],
+                "by_status": data["by_status"],
+                "by_assignee": data["by_assignee"],
+                "incident_sla_count_by_priority": data["incident_sla_count_by_priority"],
                 "incident_sla_avg_resolution_by_priority": {
                     prio: round(sum(times) / len(times), 2)
                     for prio, times in data["incident_sla_resolution_by_priority"].items()
@@ -941,6 +1540,13 @@ def _summarize_and_analyze_jql(jql: str) -> Dict:
         raise HTTPException(status_code=500, detail=f"Failed to analyze JQL: {e}")
 
 
+
+
+def _iter_issue_keys(jql: str) -> Iterator[str]:
+    """Yield issue keys matching `jql` page by page without materializing the full list."""
+    return map(itemgetter("key"), _iter_jql_issues(jql, ["key"], _KEY_PAGE_SIZE))
+
+
 def _get_issue_keys(jql: str) -> List[str]:
     """
     Fetches issue keys for all issues matching the given JQL.
@@ -952,29 +1558,7 @@ def _get_issue_keys(jql: str) -> List[str]:
         List[str]: List of issue keys.
     """
     try:
-        issue_keys = []
-        next_page_token = None
-        max_results = 100
-
-        while True:
-            issues = jira.enhanced_search_issues(
-                jql_str=jql,
-                nextPageToken=next_page_token,
-                maxResults=max_results,
-                fields=["key"],
-                use_post=True
-            )
-
-            if not issues:
-                break
-
-            issue_keys.extend([issue.key for issue in issues])
-            next_page_token = getattr(issues, "nextPageToken", None)
-
-            if not next_page_token:
-                break
-
-        return issue_keys
+        return list(_iter_issue_keys(jql))
 
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to fetch issue keys: {e}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Failed to fetch issue keys: {e}")
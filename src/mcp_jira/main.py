@@ -6,6 +6,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..",
 import mcp_jira.helpers as helpers
 
 
+import asyncio
+import functools
 import json
 import os
 import re
@@ -13,94 +15,83 @@ import textwrap
 from typing import Counter, Dict, List, Optional
 from fastapi import HTTPException, APIRouter 
 from fastmcp import FastMCP
-from jira import JIRA
 from dotenv import load_dotenv
 
 
-from mcp_common.utils.bedrock_wrapper import call_claude
-
 load_dotenv(override=True)
 
-JIRA_URL = os.getenv("JIRA_BASE_URL")
-JIRA_USER = os.getenv("JIRA_EMAIL","")
-JIRA_TOKEN = os.getenv("JIRA_API_TOKEN","")
-
 DEFAULT_CATEGORY = os.getenv("DEFAULT_PROJECT_CATEGORY", "")
-EXCLUDED_KEYS = [k.strip() for k in os.getenv("EXCLUDED_PROJECT_KEYS", "").split(",") if k.strip()]
-
-jira = JIRA(server=JIRA_URL, basic_auth=(JIRA_USER, JIRA_TOKEN))
+EXCLUDED_KEYS = frozenset(k.strip() for k in os.getenv("EXCLUDED_PROJECT_KEYS", "").split(",") if k.strip())
 
 
 
 mcp = FastMCP("Jira MCP Server", auth=None)
 
 
+def safe_tool(fn):
+    """
+    Turn unexpected errors of a dict-returning async tool into {"error": "..."}.
+    HTTPException is re-raised so deliberate HTTP errors keep their status.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await fn(*args, **kwargs)
+        except HTTPException:
+            raise
+        except Exception as e:
+            return {"error": str(e)}
+
+    return wrapper
+
+
 @mcp.tool()
-def search_issues(jql: str, max_results: int = 5) -> list[dict]:
+async def search_issues(jql: str, max_results: int = 5) -> list[dict]:
     """
     Search Jira issues using a JQL query.
     Returns a list of issue keys and summaries.
     """
-    issues = jira.search_issues(jql, maxResults=max_results)
-    return [{"key": issue.key, "summary": issue.fields.summary} for issue in issues]
-
+    return await asyncio.to_thread(helpers._search_issues, jql, max_results)
 
 
 @mcp.tool()
-def get_issue(key: str) -> dict:
+@safe_tool
+async def get_issue(key: str) -> dict:
     """
     Retrieve full details for a Jira issue by key.
     """
-    try:
-        issue = jira.issue(key)
-        return helpers._extract_issue_fields(issue, include_comments=True, jira_client=jira)
-    except Exception as e:
-        return {"error": str(e)}
-
-
-
+    return await asyncio.to_thread(helpers._get_issue, key)
 
 
 @mcp.tool()
-def get_available_issue_statuses(key: str) -> list[str]:
+async def get_available_issue_statuses(key: str) -> list[str]:
     """
     Get the list of available statuses the given issue can transition to.
     This returns the display names of valid transitions for the issue's current workflow state.
     """
-    try:
-        transitions = jira.transitions(key)
-        return [t['to']['name'] for t in transitions]
-    except Exception as e:
-        return [f"Error: {str(e)}"]
+    return await asyncio.to_thread(helpers._get_available_issue_statuses, key)
+
 
 @mcp.tool()
-def list_projects() -> list[dict]:
+async def list_projects() -> list[dict]:
     """
     List Jira projects visible to the current user.
 
     """
-    return helpers._list_projects()
+    return await asyncio.to_thread(helpers._list_projects)
 
 
 @mcp.tool
-def get_all_issue_types() -> List[str]:
+async def get_all_issue_types() -> List[str]:
     """
     Fetches all globally available issue types (task types) from Jira.
     Returns a de-duplicated, sorted list of issue type names.
     """
-    try:
-        global_issue_types = jira.issue_types()
-        issue_type_set = {it.name for it in global_issue_types}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to fetch global issue types: {e}")
-
-    return sorted(issue_type_set)
-
-
+    return await asyncio.to_thread(helpers._get_all_issue_types)
 
 
 @mcp.tool()
-def resolve_project_name(human_input: str) -> List[Dict[str, str]]:
+async def resolve_project_name(human_input: str) -> List[Dict[str, str]]:
     """
     Resolve a Jira project name from human-friendly input.
     Fetches available Jira projects and chooses the best match.
@@ -111,13 +102,11 @@ def resolve_project_name(human_input: str) -> List[Dict[str, str]]:
     Returns:
     - The matching Jira project name (e.g., 'Website Comapny'), or raises error if not found or invalid.
     """
-    
-    return helpers._resolve_project_name(human_input, DEFAULT_CATEGORY)
-
+    return await asyncio.to_thread(helpers._resolve_project_name, human_input, DEFAULT_CATEGORY)
 
 
 @mcp.tool()
-def get_all_statuses_for_project(project_key: str) -> list[str]:
+async def get_all_statuses_for_project(project_key: str) -> list[str]:
     """
     Get all available issue statuses in a Jira project.
 
@@ -131,34 +120,7 @@ def get_all_statuses_for_project(project_key: str) -> list[str]:
     - A sorted list of unique status display names used in the project's workflows.
       If an error occurs, returns a list with a single error message.
     """
-    try:
-        project = jira.project(project_key)
-        issue_types = project.issueTypes
-        statuses = set()
-
-        for issue_type in issue_types:
-            try:
-                meta = jira.createmeta(
-                    projectKeys=project_key,
-                    issuetypeNames=issue_type.name,
-                    expand="projects.issuetypes.fields"
-                )
-                for project_meta in meta.get('projects', []):
-                    for itype in project_meta.get('issuetypes', []):
-                        if itype.get('name') == issue_type.name:
-                            fields = itype.get('fields', {})
-                            status_field = fields.get('status')
-                            if status_field and 'allowedValues' in status_field:
-                                for s in status_field['allowedValues']:
-                                    statuses.add(s['name'])
-            except Exception:
-                continue  # Continue with next issue type if this one fails
-
-        return sorted(statuses)
-
-    except Exception as e:
-        return [f"Error: {str(e)}"]
-
+    return await asyncio.to_thread(helpers._get_all_statuses_for_project, project_key)
 
 
 @mcp.tool()
@@ -180,7 +142,7 @@ def parse_jira_date(input_str: str) -> str:
     return helpers._parse_jira_date(input_str)
 
 @mcp.tool
-def generate_jql_from_input(user_input: str) -> dict:
+async def generate_jql_from_input(user_input: str) -> dict:
     """
     Generate a valid Jira JQL string from natural language input using AI assistance,
     and estimate how many issues match that JQL.
@@ -194,7 +156,7 @@ def generate_jql_from_input(user_input: str) -> dict:
     - approx_query_results: estimated number of matching issues
     - comment: AI agent comment or explanation, if any
     """
-    result = helpers._generate_jql_from_input(user_input=user_input)
+    result = await asyncio.to_thread(helpers._generate_jql_from_input, user_input=user_input)
 
     return {
         "jql": result.get("jql", ""),
@@ -203,9 +165,8 @@ def generate_jql_from_input(user_input: str) -> dict:
     }
 
 
-
 @mcp.tool
-def execute_jql_query(jql: str) -> List[Dict]:
+async def execute_jql_query(jql: str) -> List[Dict]:
     """
     Executes a JQL query and returns all matching issues using Jira Cloud's enhanced search via automatic pagination.
 
@@ -222,17 +183,14 @@ def execute_jql_query(jql: str) -> List[Dict]:
     - priority
     """
     try:
-        return helpers._execute_jql_query(jql)
+        return await asyncio.to_thread(helpers._execute_jql_query, jql)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to execute JQL: {e}")
 
 
-
-
-
 @mcp.tool
-def summarize_and_analyze_jira_issues(jql: str) -> Dict:
+async def summarize_and_analyze_jira_issues(jql: str) -> Dict:
     """
     Summarize Jira issues matching a JQL query, grouped per project.
 
@@ -250,7 +208,7 @@ def summarize_and_analyze_jira_issues(jql: str) -> Dict:
     - incident_sla_count_by_priority: number of Incident SLA tickets by priority
     - incident_sla_avg_resolution_by_priority: average resolution time in days for Incident SLA by priority
     """
-    return helpers._summarize_and_analyze_jql(jql)
+    return await asyncio.to_thread(helpers._summarize_and_analyze_jql, jql)
 
 
 # @mcp.tool()
@@ -297,7 +255,7 @@ def summarize_and_analyze_jira_issues(jql: str) -> Dict:
 
 
 @mcp.tool()
-def get_tickets_insights(ticket_keys: List[str]) -> Dict:
+async def get_tickets_insights(ticket_keys: List[str]) -> Dict:
     """
     Generates intelligent insights and structured summaries for a list of Jira tickets.
 
@@ -314,13 +272,11 @@ def get_tickets_insights(ticket_keys: List[str]) -> Dict:
     A dictionary where each key is the ticket key and the value is the generated summary string.
     If a ticket fails to summarize, an error message is returned instead.
     """
-    return helpers._get_tickets_insights(ticket_keys)
-
-
+    return await asyncio.to_thread(helpers._get_tickets_insights, ticket_keys)
 
 
 @mcp.tool()
-def approximate_jira_issue_count(jql: str) -> Dict:
+async def approximate_jira_issue_count(jql: str) -> Dict:
     """
     Executes a JQL query and returns an approximate count of matching Jira issues.
 
@@ -340,7 +296,7 @@ def approximate_jira_issue_count(jql: str) -> Dict:
         "jql": "<original input>"
       }
     """
-    return helpers._approximate_jira_issue_count(jql)
+    return await asyncio.to_thread(helpers._approximate_jira_issue_count, jql)
 
 
 # @mcp.tool
@@ -381,7 +337,7 @@ def approximate_jira_issue_count(jql: str) -> Dict:
 
 
 @mcp.tool
-def get_issue_keys(jql: str) -> List[str]:
+async def get_issue_keys(jql: str) -> List[str]:
     """
     Get a list of issue keys matching a given JQL query.
 
@@ -391,11 +347,12 @@ def get_issue_keys(jql: str) -> List[str]:
     Returns:
     A list of issue keys that match the query.
     """
-    return helpers._get_issue_keys(jql)
+    return await asyncio.to_thread(helpers._get_issue_keys, jql)
 
 
 @mcp.tool
-def extract_issue_fields(ticket_key: str, include_comments: bool = False) -> dict:
+@safe_tool
+async def extract_issue_fields(ticket_key: str, include_comments: bool = False) -> dict:
     """
     Parameters:
     - ticket_key: Jira issue key (e.g., "PROJ-123")
@@ -404,11 +361,17 @@ def extract_issue_fields(ticket_key: str, include_comments: bool = False) -> dic
     Returns:
     A dictionary with issue metadata and optionally comments.
     """
-    try:
-        issue = jira.issue(ticket_key)
-        return helpers._extract_issue_fields(issue, include_comments=include_comments, jira_client=jira if include_comments else None)
-    except Exception as e:
-        return {"error": f"Failed to extract fields for {ticket_key}: {e}"}
+    return await asyncio.to_thread(helpers._extract_issue_fields_by_key, ticket_key, include_comments)
+
+
+@mcp.tool
+def invalidate_project_cache() -> Dict[str, str]:
+    """
+    Drop cached Jira metadata (projects, issue types, statuses, priorities) and cached issues so the
+    next tool call fetches fresh data. Use after projects or workflows were changed.
+    """
+    helpers.invalidate_cache()
+    return {"status": "ok"}
 
 
 if __name__ == "__main__":
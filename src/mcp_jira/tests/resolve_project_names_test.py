@@ -1,8 +1,9 @@
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
-from mcp_jira.helpers import _resolve_project_name, get_all_jira_projects
+from mcp_jira.helpers import _resolve_project_name
 
 test_cases = [
     {"input": "AKB", "expected_name": "AK Bank", "expected_key": "AKB"},
@@ -19,31 +20,40 @@ test_cases = [
 ]
 
 
-def test_resolve_project_names():
-    from mcp_jira.helpers import _resolve_project_name  # adjust if path differs
+def _run_case(case):
+    """Resolve one case; each call is an independent Jira/LLM round trip."""
+    try:
+        return case, _resolve_project_name(case["input"]), None
+    except Exception as e:
+        return case, None, e
+
 
+def test_resolve_project_names():
     passed = 0
     failed = 0
+    lines = []
 
-    for case in test_cases:
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        outcomes = list(executor.map(_run_case, test_cases))
+
+    for case, result, error in outcomes:
         user_input = case["input"]
         expected = case["expected_name"]
-        try:
-            result = _resolve_project_name(user_input)
-            if not result:
-                print(f"❌ NO RESULT for input: '{user_input}' (expected: {expected})")
-                failed += 1
-            elif expected in [r["name"] for r in result]:
-                print(f"✅ PASS: '{user_input}' → matched '{expected}'")
-                passed += 1
-            else:
-                print(f"❌ FAIL: '{user_input}' → got {[r['name'] for r in result]}, expected '{expected}'")
-                failed += 1
-        except Exception as e:
-            print(f"❌ EXCEPTION for '{user_input}': {e}")
+        if error is not None:
+            lines.append(f"❌ EXCEPTION for '{user_input}': {error}")
+            failed += 1
+        elif not result:
+            lines.append(f"❌ NO RESULT for input: '{user_input}' (expected: {expected})")
+            failed += 1
+        elif expected in [r["name"] for r in result]:
+            lines.append(f"✅ PASS: '{user_input}' → matched '{expected}'")
+            passed += 1
+        else:
+            lines.append(f"❌ FAIL: '{user_input}' → got {[r['name'] for r in result]}, expected '{expected}'")
             failed += 1
 
-    print(f"\nSummary: ✅ {passed} passed, ❌ {failed} failed")
+    lines.append(f"\nSummary: ✅ {passed} passed, ❌ {failed} failed")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 
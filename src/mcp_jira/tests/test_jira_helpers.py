@@ -0,0 +1,63 @@
+import pytest
+
+import mcp_jira.helpers as helpers
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2025-07-01", "2025-07-01"),
+    ("01/07/2025", "2025-07-01"),   # day first
+    ("1 Jul 2025", "2025-07-01"),
+    ("July 1, 2025", "2025-07-01"),
+])
+def test_parse_jira_date_full_dates(text, expected):
+    assert helpers._parse_jira_date(text) == expected
+
+
+@pytest.mark.parametrize("text", ["2024", "July", "12", "March 2025", "not a date"])
+def test_parse_jira_date_rejects_partial_dates(text):
+    with pytest.raises(ValueError, match="Unrecognized date format"):
+        helpers._parse_jira_date(text)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("open tickets from the past 2 weeks", "created >= -2w AND resolution in (Unresolved, EMPTY)"),
+    ("Show me all issues created in the last 3 days.", "created >= -3d"),
+    ("issues in the last month", "created >= -30d"),
+    ("unresolved tickets since the past 2 quarters?", "created >= -180d AND resolution in (Unresolved, EMPTY)"),
+])
+def test_fast_path_jql(text, expected):
+    assert helpers._fast_path_jql(text)["jql"] == expected
+
+
+@pytest.mark.parametrize("text", [
+    "open tickets for HSB",
+    "tickets from the past 2 weeks assigned to me",
+    "closed tickets from last week",
+])
+def test_fast_path_jql_defers(text):
+    assert helpers._fast_path_jql(text) is None
+
+
+_PROJECTS = (("HSB", "High Street Bank"), ("OPS", "Operations"))
+_PRIORITIES = ("High", "Medium", "Low")
+
+
+@pytest.mark.parametrize("text, expected", [
+    # "High" is part of the project name, not a priority filter
+    ("tickets for High Street Bank", "project = HSB"),
+    ("open high tickets for HSB", 'project = HSB AND priority IN ("High") AND resolution in (Unresolved, EMPTY)'),
+    ("high tickets for Operations", 'project = OPS AND priority IN ("High")'),
+    ("resolved tickets for hight street bank", "project = HSB AND resolution NOT IN (Unresolved, EMPTY)"),
+])
+def test_rule_based_jql(text, expected):
+    assert helpers._rule_based_jql(text, _PROJECTS, _PRIORITIES)["jql"] == expected
+
+
+@pytest.mark.parametrize("text", [
+    "high tickets for hihg street bank",  # fuzzy project match would swallow a priority word
+    "tickets for operations and hsb",
+    "open and closed tickets",
+    "tickets",
+])
+def test_rule_based_jql_defers_to_llm(text):
+    assert helpers._rule_based_jql(text, _PROJECTS, _PRIORITIES) is None
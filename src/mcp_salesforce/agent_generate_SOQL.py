@@ -1,20 +1,26 @@
+import asyncio
 import os
 import re
 import json
+import textwrap
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-from typing import Annotated, Any, Dict, List, Optional, Union
+from typing import Annotated, Any, AsyncIterator, Dict, List, Mapping, Optional, Tuple, Union
 
 from dotenv import load_dotenv
 from simple_salesforce.api import Salesforce
-from simple_salesforce.exceptions import SalesforceMalformedRequest
+from simple_salesforce.exceptions import SalesforceExpiredSession, SalesforceMalformedRequest
 from typing_extensions import TypedDict
+from pydantic import BaseModel, Field, ValidationError
 
 from langgraph.prebuilt import ToolNode
 from langchain_aws.chat_models.bedrock import ChatBedrock
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langchain_core.tools import tool
+from langchain_core.utils.function_calling import convert_to_openai_tool
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage, SystemMessage
 from typing import cast
 import datetime
@@ -34,11 +40,38 @@ except Exception:
     SF = None  # connect lazily on first tool use
 
 
-def init_chat_model(model_key: str = "NOVA_LITE_MODEL_ID") -> ChatBedrock:
-    """Initialize the Bedrock chat model."""
+# Bedrock latency-optimized inference is only offered for a few models; opt in with
+# BEDROCK_LATENCY_OPTIMIZED=1 and it is applied when the model id matches one of these.
+BEDROCK_LATENCY_OPTIMIZED = os.getenv("BEDROCK_LATENCY_OPTIMIZED", "0").lower() in ("1", "true", "yes")
+_LATENCY_OPTIMIZED_MODELS = ("claude-3-5-haiku", "llama3-1-70b", "llama3-1-405b", "nova-pro")
+
+
+def init_chat_model(model_key: str = "NOVA_LITE_MODEL_ID", max_tokens: Optional[int] = None) -> ChatBedrock:
+    """Initialize the Bedrock chat model; max_tokens caps the output for short, single-value answers."""
     model_id = os.environ[model_key]
     region = os.environ["AWS_REGION"]
-    return ChatBedrock(model=model_id, region=region, model_kwargs={"temperature": 0})
+    model_kwargs: Dict[str, Any] = {"temperature": 0}
+    extra: Dict[str, Any] = {}
+    if BEDROCK_LATENCY_OPTIMIZED and any(m in model_id for m in _LATENCY_OPTIMIZED_MODELS):
+        # Only the Converse API takes performanceConfig; InvokeModel would copy it into the
+        # request body and Bedrock rejects it, so force Converse (the default only for Nova)
+        model_kwargs["performance_config"] = {"latency": "optimized"}
+        extra["beta_use_converse_api"] = True
+    # streaming=True: tokens flow through the callback system, so astream_events sees them
+    return ChatBedrock(
+        model=model_id, region=region, model_kwargs=model_kwargs, streaming=True, max_tokens=max_tokens, **extra
+    )
+
+
+@lru_cache(maxsize=4)
+def _cached_chat_model(model_key: str, max_tokens: Optional[int] = None) -> ChatBedrock:
+    """One ChatBedrock (and boto3 client) per model key, reused across turns and requests."""
+    return init_chat_model(model_key, max_tokens)
+
+
+# Small reformatting steps (date parsing) go to the cheaper model when one is configured;
+# the manager stays on NOVA_LITE_MODEL_ID.
+SMALL_MODEL_KEY = "NOVA_MICRO_MODEL_ID" if os.getenv("NOVA_MICRO_MODEL_ID") else "NOVA_LITE_MODEL_ID"
 
 
 # --------------------------------------------------------------------------------------
@@ -54,13 +87,18 @@ class State(TypedDict):
 
 
 
-def _trace_as_text(state: Dict[str, Any]) -> str:
-    """Return a readable transcript string (no printing)."""
-    messages = state["messages"] if isinstance(state, dict) and "messages" in state else state
+_TRACE_RULE = "-" * 80
+
+
+def _indent(text: str) -> str:
+    return textwrap.indent(text, "  ")
+
+
+def _trace_lines(messages: List[Any], start: int = 0) -> List[str]:
+    """Transcript lines for messages[start:], numbered by their position in the conversation."""
     lines: List[str] = []
-    lines.append("\n💬 Conversation Trace\n" + "-" * 80)
 
-    for idx, m in enumerate(messages, 1):
+    for idx, m in enumerate(messages[start:], start + 1):
         if isinstance(m, HumanMessage):
             lines.append(f"\n[{idx}] 🧑‍💻 User:\n  {str(m.content).strip()}")
 
@@ -73,14 +111,14 @@ def _trace_as_text(state: Dict[str, Any]) -> str:
                     if btype == "text":
                         t = (block.get("text", "") if isinstance(block, dict) else "").strip()
                         if t:
-                            lines.append("  " + t.replace("\n", "\n  "))
+                            lines.append(_indent(t))
                     elif btype == "tool_use":
                         name = block.get("name", "") if isinstance(block, dict) else ""
                         args = block.get("input", {}) if isinstance(block, dict) else {}
                         lines.append(f"  🔧 Tool Call → {name}({json.dumps(args, ensure_ascii=False)})")
             elif isinstance(content, str):
                 if content.strip():
-                    lines.append("  " + content.strip().replace("\n", "\n  "))
+                    lines.append(_indent(content.strip()))
                 if getattr(m, "tool_calls", None):
                     for tc in m.tool_calls:
                         lines.append(f"  🔧 Tool Call → {tc['name']}({json.dumps(tc.get('args', {}), ensure_ascii=False)})")
@@ -92,13 +130,19 @@ def _trace_as_text(state: Dict[str, Any]) -> str:
             lines.append(f"\n[{idx}] 🛠️ Tool Response [{status}]:")
             c = m.content
             if isinstance(c, (dict, list)):
-                lines.append("  " + json.dumps(c, indent=2, ensure_ascii=False).replace("\n", "\n  "))
+                lines.append(_indent(json.dumps(c, indent=2, ensure_ascii=False)))
             elif isinstance(c, str):
-                try:
-                    loaded = json.loads(c)
-                    lines.append("  " + json.dumps(loaded, indent=2, ensure_ascii=False).replace("\n", "\n  "))
-                except Exception:
-                    lines.append("  " + str(c).strip().replace("\n", "\n  "))
+                stripped = c.strip()
+                loaded: Any = None
+                if stripped[:1] in ("{", "["):  # only try JSON when it can be JSON
+                    try:
+                        loaded = json.loads(stripped)
+                    except ValueError:
+                        loaded = None
+                if loaded is not None:
+                    lines.append(_indent(json.dumps(loaded, indent=2, ensure_ascii=False)))
+                else:
+                    lines.append(_indent(stripped))
             else:
                 lines.append("  " + str(c))
 
@@ -108,71 +152,146 @@ def _trace_as_text(state: Dict[str, Any]) -> str:
         else:
             lines.append(f"\n[{idx}] ⚠️ {type(m).__name__}: {m}")
 
-    lines.append("-" * 80 + "\n")
-    return "\n".join(lines)
+    return lines
 
 
-# --------------------------------------------------------------------------------------
-# CORE FIELD INDEX (tiny whitelist to keep tokens low)
-# --------------------------------------------------------------------------------------
-def _find(desc: Dict[str, Any], candidates: List[str]) -> Optional[Dict[str, Any]]:
-    for f in desc.get("fields", []):
-        if f.get("name") in candidates:
-            return f
-    return None
+def _format_trace(lines: List[str]) -> str:
+    return "\n".join(["\n💬 Conversation Trace\n" + _TRACE_RULE, *lines, _TRACE_RULE + "\n"])
 
 
-def _schema_entry(f: Dict[str, Any]) -> Dict[str, Any]:
-    out: Dict[str, Any] = {
-        "api": f["name"],
-        "label": f.get("label"),
-        "type": f.get("type"),
-        "filterable": bool(f.get("filterable")),
-        "sortable": bool(f.get("sortable")),
-    }
-    if f.get("type") == "picklist":
-        out["values"] = [pv["value"] for pv in f.get("picklistValues", []) if pv.get("active", True)]
-    if f.get("referenceTo"):
-        out["references"] = f.get("referenceTo")
-        if f.get("relationshipName"):
-            out["relationshipName"] = f["relationshipName"]
-    return out
+def _trace_as_text(state: Dict[str, Any]) -> str:
+    """Return a readable transcript string (no printing)."""
+    messages = state["messages"] if isinstance(state, dict) and "messages" in state else state
+    return _format_trace(_trace_lines(messages))
+
+
+# --------------------------------------------------------------------------------------
+# REGEXES (compiled once; used on every validate/parse call)
+# --------------------------------------------------------------------------------------
+_LIMIT_RE = re.compile(r"\blimit\s+\d+\b", re.IGNORECASE)
+_GROUP_BY_RE = re.compile(r"\bgroup\s+by\b", re.IGNORECASE)
+_SIMPLE_SELECT_RE = re.compile(
+    r"^\s*select\s+.+?\s+from\s+([a-zA-Z0-9_]+)\s*(where\s+.+?)?(order\s+by\s+.+?)?$",
+    re.IGNORECASE | re.DOTALL,
+)
+_ISO_DT_RE = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z")
+_ISO_D_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
 
 
 # --------------------------------------------------------------------------------------
 # TOOLS
 # --------------------------------------------------------------------------------------
-@tool
-def parse_salesforce_date_tool(natural_input: str, want_datetime: bool = False) -> str:
-    """
-    Convert natural language date/time to an ISO string for SOQL:
-      - Date: YYYY-MM-DD
-      - Datetime: YYYY-MM-DDThh:mm:ssZ (UTC)
-    """
-    today = datetime.datetime.utcnow()
+# Phrases that map 1:1 to Salesforce date literals (usable unquoted in WHERE clauses)
+_SF_DATE_LITERALS: Dict[str, str] = {
+    "today": "TODAY",
+    "yesterday": "YESTERDAY",
+    "tomorrow": "TOMORROW",
+    "this week": "THIS_WEEK",
+    "last week": "LAST_WEEK",
+    "next week": "NEXT_WEEK",
+    "this month": "THIS_MONTH",
+    "last month": "LAST_MONTH",
+    "next month": "NEXT_MONTH",
+    "this quarter": "THIS_QUARTER",
+    "last quarter": "LAST_QUARTER",
+    "next quarter": "NEXT_QUARTER",
+    "this year": "THIS_YEAR",
+    "last year": "LAST_YEAR",
+    "next year": "NEXT_YEAR",
+    "this fiscal quarter": "THIS_FISCAL_QUARTER",
+    "last fiscal quarter": "LAST_FISCAL_QUARTER",
+    "this fiscal year": "THIS_FISCAL_YEAR",
+    "last fiscal year": "LAST_FISCAL_YEAR",
+}
+_SF_LITERAL_UNITS = {"day": "DAYS", "week": "WEEKS", "month": "MONTHS", "quarter": "QUARTERS", "year": "YEARS"}
+_RELATIVE_N_RE = re.compile(r"^(?:last|past|previous|next)\s+(\d+)\s+(day|week|month|quarter|year)s?$")
+_AGO_RE = re.compile(r"^(\d+)\s+(day|week|month|quarter|year)s?\s+ago$")
+# Same duration convention as the LLM prompt below
+_UNIT_DAYS = {"day": 1, "week": 7, "month": 30, "quarter": 90, "year": 365}
+# dateutil fills missing parts from `default`; two defaults differing in year, month and day
+# give the same result only when the text names a full date
+_DATE_DEFAULTS = (datetime.datetime(2000, 1, 1), datetime.datetime(2001, 2, 2))
+
+
+def _local_date_parse(text: str, want_datetime: bool, today: datetime.date) -> Optional[str]:
+    """Resolve common phrasings without the LLM; None when the phrase needs one."""
+    literal = _SF_DATE_LITERALS.get(text)
+    if literal:
+        return literal
+
+    m = _RELATIVE_N_RE.match(text)
+    if m:
+        direction = "NEXT" if text.startswith("next") else "LAST"
+        return f"{direction}_N_{_SF_LITERAL_UNITS[m.group(2)]}:{m.group(1)}"
+
+    m = _AGO_RE.match(text)
+    if m:
+        d = today - datetime.timedelta(days=int(m.group(1)) * _UNIT_DAYS[m.group(2)])
+        return f"{d.isoformat()}T00:00:00Z" if want_datetime else d.isoformat()
+
+    # Absolute dates ("2025-03-01", "March 5 2025", "5/3/2025 14:00"); weekday-only
+    # phrases are left to the LLM because dateutil resolves them forward in time.
+    if any(ch.isdigit() for ch in text):
+        try:
+            from dateutil import parser as date_parser
+
+            dt = date_parser.parse(text, default=_DATE_DEFAULTS[0])
+            if date_parser.parse(text, default=_DATE_DEFAULTS[1]) != dt:
+                return None  # partial ("March 2025", "2024", "12"): dateutil filled in the rest
+        except (ValueError, OverflowError, ImportError):
+            return None
+        if want_datetime or dt.time() != datetime.time():
+            if dt.tzinfo is not None:
+                dt = dt.astimezone(datetime.timezone.utc)
+            return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+        return dt.date().isoformat()
+
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _parse_salesforce_date(text: str, want_datetime: bool, today: datetime.date) -> str:
+    local = _local_date_parse(text, want_datetime, today)
+    if local:
+        return local
+
+    now = datetime.datetime.utcnow()
     system_prompt = (
         "You convert natural language date/time expressions into a single ISO string for Salesforce SOQL.\n"
-        f"Current UTC datetime is: {today.strftime('%Y-%m-%dT%H:%M:%SZ')}\n\n"
+        f"Current UTC datetime is: {now.strftime('%Y-%m-%dT%H:%M:%SZ')}\n\n"
         "Output rules:\n"
         "- If a time-of-day is provided or implied, output a UTC datetime in format YYYY-MM-DDThh:mm:ssZ.\n"
         "- Otherwise output a date in YYYY-MM-DD.\n"
         "- Durations: week=7 days, month=30 days, quarter=90 days, year=365 days.\n"
         "- Output only the ISO string; no explanations."
     )
-    llm = init_chat_model("NOVA_LITE_MODEL_ID")
+    llm = _cached_chat_model(SMALL_MODEL_KEY, max_tokens=64)  # one ISO string
     resp = llm.invoke(
-        [SystemMessage(content=system_prompt), HumanMessage(content=f"Convert: {natural_input}\nForce datetime: {bool(want_datetime)}")]
+        [SystemMessage(content=system_prompt), HumanMessage(content=f"Convert: {text}\nForce datetime: {bool(want_datetime)}")]
     ).content
-    mdt = re.search(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z", str(resp))
+    mdt = _ISO_DT_RE.search(str(resp))
     if mdt:
         return mdt.group(0)
-    md = re.search(r"\d{4}-\d{2}-\d{2}", str(resp))
+    md = _ISO_D_RE.search(str(resp))
     if md:
         return md.group(0)
     raise ValueError(f"Could not parse date from: {resp}")
 
 
 @tool
+def parse_salesforce_date_tool(natural_input: str, want_datetime: bool = False) -> str:
+    """
+    Convert natural language date/time to a value usable in SOQL:
+      - Salesforce date literal for common ranges (e.g., LAST_QUARTER, LAST_N_DAYS:30)
+      - Date: YYYY-MM-DD
+      - Datetime: YYYY-MM-DDThh:mm:ssZ (UTC)
+    """
+    text = " ".join(natural_input.lower().split())
+    return _parse_salesforce_date(text, bool(want_datetime), datetime.datetime.utcnow().date())
+
+
+@tool
+@helpers.retry_on_expired_session
 def validate_soql_tool(soql: str) -> Dict[str, Any]:
     """
     Execute the SOQL with LIMIT 1 to validate syntax; also try COUNT() estimate for simple selects.
@@ -180,48 +299,83 @@ def validate_soql_tool(soql: str) -> Dict[str, Any]:
     """
     sf = helpers.get_sf_connection()
     try:
-        test_query = soql if re.search(r"\blimit\s+\d+\b", soql, re.IGNORECASE) else soql.rstrip() + " LIMIT 1"
-        sample_res = sf.query(test_query)
-        sample_record = None
-        if sample_res.get("records"):
-            sample_record = helpers._strip_attributes([sample_res["records"][0]])[0]
+        test_query = soql if _LIMIT_RE.search(soql) else soql.rstrip() + " LIMIT 1"
 
-        count_val = None
-        simple_match = re.match(
-            r"^\s*select\s+.+?\s+from\s+([a-zA-Z0-9_]+)\s*(where\s+.+?)?(order\s+by\s+.+?)?$",
-            soql,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
-        if simple_match and " group by " not in soql.lower():
+        count_query = None
+        simple_match = _SIMPLE_SELECT_RE.match(soql)
+        if simple_match and not _GROUP_BY_RE.search(soql):
             obj = simple_match.group(1)
             where = simple_match.group(2) or ""
             count_query = f"SELECT COUNT() FROM {obj} {where}"
-            count_res = sf.query(count_query)
-            count_val = count_res.get("totalSize", None)
+
+        # Sample and COUNT() are independent round trips: run them side by side
+        count_res = None
+        if count_query:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                sample_future = executor.submit(sf.query, test_query)
+                count_future = executor.submit(sf.query, count_query)
+                sample_res = sample_future.result()
+                count_res = count_future.result()
+        else:
+            sample_res = sf.query(test_query)
+
+        sample_record = None
+        if sample_res.get("records"):
+            sample_record = helpers._strip_attributes([sample_res["records"][0]])[0]
+
+        count_val = count_res.get("totalSize", None) if count_res else None
 
         return {"soql": soql, "valid": True, "sample": sample_record, "count": count_val, "error": None}
     except SalesforceMalformedRequest as e:
         return {"soql": soql, "valid": False, "sample": None, "count": None, "error": f"MALFORMED_QUERY: {getattr(e, 'content', e)}"}
+    except SalesforceExpiredSession:
+        raise  # retry_on_expired_session logs in again
     except Exception as e:
         return {"soql": soql, "valid": False, "sample": None, "count": None, "error": str(e)}
 
 
+@helpers.retry_on_expired_session
+def _describe_field(object_name: str, field_name: str) -> Dict[str, Any]:
+    for field in getattr(helpers.get_sf_connection(), object_name).describe()["fields"]:
+        if field["name"] == field_name:
+            return field
+    raise ValueError(f"{field_name} field not found on {object_name}.")
+
+
+# (core_schema entry the names were read alongside, all StageName values incl. inactive)
+_ALL_STAGE_NAMES: Tuple[Optional[Mapping[str, Any]], Tuple[str, ...]] = (None, ())
+
+
+def _stage_names(active_only: bool) -> Tuple[str, ...]:
+    """
+    Opportunity.StageName values. The active ones come straight from core_schema; the full list
+    needs a describe() and is kept until core_schema refreshes its StageName entry (SCHEMA_TTL).
+    """
+    global _ALL_STAGE_NAMES
+    entry = core_schema.get_schema_for_attribute("Opportunity.StageName")
+    if entry is None:
+        raise ValueError("StageName field not found on Opportunity.")
+    if active_only:
+        return tuple(entry.get("values", ()))
+    seen, names = _ALL_STAGE_NAMES
+    if seen is not entry:
+        pvs = _describe_field("Opportunity", "StageName").get("picklistValues", ())
+        names = tuple(map(core_schema._PICKLIST_VALUE, pvs))
+        _ALL_STAGE_NAMES = (entry, names)
+    return names
+
+
 @tool
 def list_stage_names_tool(active_only: bool = True) -> List[str]:
     """Return ONLY the available values for Opportunity.StageName (active by default)."""
-    sf = helpers.get_sf_connection()
-    opportunity: Any = sf.Opportunity
-    meta = opportunity.describe()
-    for field in meta["fields"]:
-        if field["name"] == "StageName":
-            vals = []
-            for pv in field.get("picklistValues", []):
-                if (not active_only) or pv.get("active", False):
-                    vals.append(pv["value"])
-            return vals
-    raise ValueError("StageName field not found on Opportunity.")
+    return list(_stage_names(bool(active_only)))
+
 
 
+def _public_schema(schema: Mapping[str, Any]) -> Dict[str, Any]:
+    """Plain (JSON-serializable) copy of a read-only schema entry without internal _keys."""
+    return {k: v for k, v in schema.items() if not k.startswith("_")}
+
 
 @tool
 def get_salesforce_field_schema(field_api: str) -> Dict[str, Any]:
@@ -258,25 +412,19 @@ def get_salesforce_field_schema(field_api: str) -> Dict[str, Any]:
                 "object": obj_norm,
                 "field": sch["api"],
                 "attribute": friendly,
-                "schema": sch,
+                "schema": _public_schema(sch),
             }
 
-        # 2) Case-insensitive / API-name lookup within same object
-        idx = core_schema.build_core_field_index_cached()
-        prefix = f"{obj_norm}."
-        fld_lower = fld_raw.lower()
-        for attr, s in idx.items():
-            if not attr.startswith(prefix):
-                continue
-            suffix = attr.split(".", 1)[1].lower()          # friendly suffix
-            api_lower = (s.get("api") or "").lower()        # actual API name
-            if fld_lower == suffix or fld_lower == api_lower:
-                return {
-                    "object": obj_norm,
-                    "field": s["api"],
-                    "attribute": attr,
-                    "schema": s,
-                }
+        # 2) Case-insensitive friendly-suffix / API-name lookup within same object
+        hit = core_schema.find_attribute(obj_norm, fld_raw)
+        if hit:
+            attr, s = hit
+            return {
+                "object": obj_norm,
+                "field": s["api"],
+                "attribute": attr,
+                "schema": _public_schema(s),
+            }
 
         return {
             "object": obj_norm,
@@ -335,6 +483,37 @@ def resolve_owner_names_tool(owner_ids: List[str]) -> List[Dict[str, Optional[st
     return helpers.resolve_owner_names_tool(owner_ids)
 
 
+class SOQLResult(BaseModel):
+    """Final answer of the SOQL agent."""
+
+    soql: str = Field(description="Final SOQL, or empty string if none could be built.")
+    approx_row_count: Optional[int] = Field(default=None, description="validate_soql_tool count, or null.")
+    resolved_stage_names: List[str] = Field(default_factory=list, description="Exact StageName values used.")
+    sample: Optional[Dict[str, Any]] = Field(default=None, description="validate_soql_tool sample, if any.")
+    comment: str = Field(default="", description="'!comment! <reason>' when soql is empty, else empty.")
+    notes: str = Field(default="", description="<=1 short sentence (include chosen entity if any).")
+
+
+@tool(args_schema=SOQLResult)
+def emit_result(
+    soql: str,
+    approx_row_count: Optional[int] = None,
+    resolved_stage_names: Optional[List[str]] = None,
+    sample: Optional[Dict[str, Any]] = None,
+    comment: str = "",
+    notes: str = "",
+) -> Dict[str, Any]:
+    """Return the final result. Call exactly once, as the last step, instead of writing the JSON as text."""
+    return SOQLResult(
+        soql=soql,
+        approx_row_count=approx_row_count,
+        resolved_stage_names=resolved_stage_names or [],
+        sample=sample,
+        comment=comment,
+        notes=notes,
+    ).model_dump()
+
+
 # Register tool list (unique, ordered)
 tools = [
     parse_salesforce_date_tool,
@@ -346,25 +525,29 @@ tools = [
     resolve_owner_names_tool,
 ]
 
+# Tool JSON schemas are static: derive them from the pydantic models once at import
+# emit_result is bound for the model but never executed: route_tools ends the graph on it.
+_TOOL_SPECS = [convert_to_openai_tool(t) for t in [*tools, emit_result]]
+
 
 # --------------------------------------------------------------------------------------
-# BOT MANAGER
+# SYSTEM PROMPT
 # --------------------------------------------------------------------------------------
-def bot_manager(state: State):
-    llm = init_chat_model("NOVA_LITE_MODEL_ID")
-    llm_with_tools = llm.bind_tools(tools)
-
-    SYSTEM_PROMPT = """You are a SOQL Builder Agent. Be terse. Minimize tokens and tool calls.
-
-    # Today's date is: {today}
-
-STRICT CADENCE (one tool call per assistant turn)
-- Do NOT emit more than one tool call in a single message.
+# Static instructions (plus the org's allow-list and stage names, rebuilt only when the
+# schema refreshes) sit before a cache checkpoint so Bedrock can reuse them on every ReAct turn; only the date
+# line after the checkpoint changes between requests.
+SYSTEM_PROMPT = """You are a SOQL Builder Agent. Be terse. Minimize tokens and tool calls.
+
+TOOL CADENCE (batch independent calls)
+- Independent lookups (get_salesforce_field_schema for several attributes, resolve_owner_names_tool,
+  find_best_name_matches for several names) MAY be emitted together in ONE message; they run in parallel.
+- Calls that depend on another call's result (e.g. validate_soql_tool) go in a later turn.
 - Do NOT include any free text when calling a tool.
 - Reuse prior results; never call the same tool with identical args twice.
 
 HARD CONSTRAINT: SCHEMA CALLS ONLY FROM WHITELIST
-- Call list_core_attribute_names_tool() once at the start of the request; treat the returned array as the *only* allowed attributes.
+- ALLOWED ATTRIBUTES (end of this prompt) is the *only* set of allowed attributes; no tool call is needed to list them.
+  Each line is "<Object>.<Field>(type[,values=[...]])"; the attribute name is the part before "(".
 - When calling get_salesforce_field_schema, you MUST derive arguments from a whitelist item:
   • Parse "<Object>.<Field>" → object_api = "<Object>", field_api = "<Field>".
   • Examples:
@@ -375,10 +558,8 @@ HARD CONSTRAINT: SCHEMA CALLS ONLY FROM WHITELIST
 
 TURN CACHE (internal only; do not print)
 TOOL_CACHE = {
-  names: [...],                  # from list_core_attribute_names_tool()
   important_attrs: [...],        # chosen subset from names
   schema: {attr -> schema},      # get_salesforce_field_schema(object_api, field_api) for used attrs only
-  stage_names_true: [...],       # list_stage_names_tool(True) if needed
   matches: [...],                # from find_best_name_matches
   date_literals: {...}           # e.g., {"created": "LAST_QUARTER"}
 }
@@ -390,10 +571,10 @@ WORKFLOW (mandatory)
    - Use the TOP match for filtering:
      • If Opportunity requested or top match.type == "Opportunity" → WHERE Id = '<opportunity_id>'.
      • Else (Account) → for Opportunity queries use WHERE AccountId = '<account_id>'; for Account queries WHERE Id = '<account_id>'.
-   - Proceed even if imperfect; note the chosen entity in final JSON notes. Do NOT ask for clarification.
+   - Proceed even if imperfect; note the chosen entity in emit_result notes. Do NOT ask for clarification.
 
-1) LIST NAMES (once):
-   - Call list_core_attribute_names_tool(); cache as TOOL_CACHE.names. Do not print.
+1) WHITELIST:
+   - Use ALLOWED ATTRIBUTES below. Do not print.
 
 2) PICK IMPORTANT ATTRIBUTES (subset of whitelist only):
    - SELECT: only requested; default Opportunity.Id, Opportunity.Name.
@@ -403,7 +584,7 @@ WORKFLOW (mandatory)
 3) FETCH SCHEMA (only for used fields; whitelist-derived calls only):
    - For each attribute used in WHERE/ORDER BY or needing type/picklist/relationship:
      • Split "<Object>.<Field>" → get_salesforce_field_schema("<Object>", "<Field>").
-     • One attribute per turn; cache in TOOL_CACHE.schema[attr].
+     • Request all needed attributes in the same turn; cache in TOOL_CACHE.schema[attr].
    - Do NOT fetch schema for unused SELECT-only fields unless needed for type/picklist validation.
 
 4) DATES (type-aware, minimal):
@@ -411,12 +592,14 @@ WORKFLOW (mandatory)
    - If no literal applies, call parse_salesforce_date_tool once:
      • Datetime (CreatedDate, LastModifiedDate, SystemModstamp): YYYY-MM-DDThh:mm:ssZ (no quotes).
      • Date-only (CloseDate): YYYY-MM-DD (no quotes).
+     • It may return a date literal (e.g., LAST_N_DAYS:30); use it as-is.
    - Never quote date/datetime literals.
 
 5) STAGE LOGIC (only if relevant):
    - If stage/open/won/lost/closed/pipeline or specific labels are mentioned:
      • Prefer booleans: open→IsClosed=false; won→IsWon=true; lost→IsClosed=true AND IsWon=false.
-     • Call list_stage_names_tool(True) once to record labels; for explicit labels, use StageName IN/NOT IN with EXACT values.
+     • For explicit labels, use StageName IN/NOT IN with EXACT values from ACTIVE STAGE NAMES below.
+     • Call list_stage_names_tool(False) only if inactive stages are needed.
 
 6) BUILD MINIMAL SOQL:
    - SELECT minimal fields; WHERE only necessary filters (include entity filter from step 0); no quotes for date/datetime literals.
@@ -434,22 +617,106 @@ WORKFLOW (mandatory)
        • Return "soql": "" and "approx_row_count": null, with `comment` starting `!comment!` describing the blocking reason.
        • Do NOT ask the user to clarify.
 
-FINAL OUTPUT (JSON only; no extra text):
-{
-  "soql": "<final SOQL or empty string>",
-  "approx_row_count": <number or null>,
-  "resolved_stage_names": ["<StageA>", "<StageB>", ...],
-  "sample": { ... },
-  "comment": "!comment! <reason if soql is empty>",
-  "notes": "<=1 short sentence (include chosen entity if any)>"
-}
+FINAL OUTPUT (emit_result tool call only; no free text):
+emit_result(
+  soql="<final SOQL or empty string>",
+  approx_row_count=<number or null>,
+  resolved_stage_names=["<StageA>", "<StageB>", ...],
+  sample={ ... },
+  comment="!comment! <reason if soql is empty>",
+  notes="<=1 short sentence (include chosen entity if any)>"
+)
 """
-    messages = state["messages"]
-    if not any(isinstance(m, SystemMessage) for m in messages):
-        messages = [SystemMessage(content=SYSTEM_PROMPT)] + messages
 
-    new_message = llm_with_tools.invoke(messages)
-    return {"messages": messages + [new_message]}
+
+# Used instead of the org data when it cannot be loaded: the allow-list then comes from a tool
+_FALLBACK_PROMPT = f"""{SYSTEM_PROMPT}
+ALLOWED ATTRIBUTES
+(not available: the org schema could not be loaded when this request started)
+- Call list_core_attribute_names_tool() once before any schema call; treat the returned array as ALLOWED ATTRIBUTES.
+- For explicit stage labels, call list_stage_names_tool(True) once and use its values as ACTIVE STAGE NAMES.
+"""
+
+
+# (core_schema index the prompt was built from, prompt text)
+_SYSTEM_PROMPT_CACHE: Tuple[Optional[Mapping[str, Any]], str] = (None, "")
+
+
+def _system_prompt() -> str:
+    """
+    SYSTEM_PROMPT plus the org data it refers to; built on first use, not at import, and rebuilt
+    whenever core_schema hands out a new index (its slices expire after SCHEMA_TTL).
+    """
+    global _SYSTEM_PROMPT_CACHE
+    combined = core_schema.build_core_field_index_cached()
+    built_from, prompt = _SYSTEM_PROMPT_CACHE
+    if built_from is combined:
+        return prompt
+    whitelist = combined["prompt"]  # "<Object>.<Field>(type[,values=[...]])" per line
+    stage_names = "\n".join(f"- {name}" for name in _stage_names(True))
+    prompt = f"{SYSTEM_PROMPT}\nALLOWED ATTRIBUTES\n{whitelist}\n\nACTIVE STAGE NAMES\n{stage_names}\n"
+    _SYSTEM_PROMPT_CACHE = (combined, prompt)
+    return prompt
+
+
+def _system_prompt_or_bare() -> str:
+    """
+    _system_prompt(), or _FALLBACK_PROMPT when the org data cannot be loaded
+    (login/describe failure): the agent then reads the allow-list and stage names
+    through list_core_attribute_names_tool / list_stage_names_tool.
+    Failures are not cached, so the next request tries again.
+    """
+    try:
+        return _system_prompt()
+    except Exception:
+        return _FALLBACK_PROMPT
+
+
+def _system_message(model_id: str, prompt: str) -> SystemMessage:
+    """System prompt with a prompt-cache checkpoint in the format the model's API expects."""
+    today = {"type": "text", "text": f"Today's date is: {datetime.date.today().isoformat()}"}
+    if "anthropic" in model_id:
+        static = {"type": "text", "text": prompt, "cache_control": {"type": "ephemeral"}}
+        return SystemMessage(content=[static, today])
+    # Converse API (Nova, ...): an explicit cachePoint block
+    return SystemMessage(content=[{"type": "text", "text": prompt}, {"cachePoint": {"type": "default"}}, today])
+
+
+# --------------------------------------------------------------------------------------
+# BOT MANAGER
+# --------------------------------------------------------------------------------------
+@lru_cache(maxsize=1)
+def _llm_with_tools():
+    """Chat model with the tool schemas bound once instead of on every graph step."""
+    return _cached_chat_model("NOVA_LITE_MODEL_ID").bind_tools(_TOOL_SPECS)
+
+
+def bot_manager(state: State):
+    llm_with_tools = _llm_with_tools()
+    new_message = llm_with_tools.invoke(state["messages"])
+    # add_messages appends; return only the new turn
+    return {"messages": [new_message]}
+
+
+async def abot_manager(state: State):
+    """bot_manager for graph.ainvoke/astream: awaits Bedrock instead of blocking the event loop."""
+    new_message = await _llm_with_tools().ainvoke(state["messages"])
+    return {"messages": [new_message]}
+
+
+def _initial_state(human_input: str, prompt: Optional[str] = None) -> State:
+    """Conversation seed: the system prompt goes in once here, not on every manager turn."""
+    if prompt is None:
+        prompt = _system_prompt_or_bare()
+    system = _system_message(os.environ["NOVA_LITE_MODEL_ID"], prompt)
+    return cast(State, {"messages": [system, HumanMessage(content=human_input)]})
+
+
+async def _ainitial_state(human_input: str) -> State:
+    """_initial_state for the async entry points: the first prompt build logs in and
+    describes the org, so it runs in a worker thread instead of on the event loop."""
+    prompt = await asyncio.to_thread(_system_prompt_or_bare)
+    return _initial_state(human_input, prompt)
 
 
 # --------------------------------------------------------------------------------------
@@ -465,18 +732,115 @@ def route_tools(state: Union[State, List[AIMessage]]):
         raise ValueError(f"Unsupported state type: {type(state)}")
 
     if ai_message and getattr(ai_message, "tool_calls", []):
+        if _emitted_result(ai_message) is not None:
+            return END
         return "tools"
     return END
 
 
+def _emitted_result(message: Any) -> Optional[Dict[str, Any]]:
+    """Arguments of an emit_result tool call on this message, if it made one."""
+    for tc in getattr(message, "tool_calls", None) or []:
+        if tc["name"] == "emit_result":
+            return tc.get("args", {})
+    return None
+
+
+def _emitted_json(emitted: Dict[str, Any]) -> str:
+    """
+    emit_result arguments as the same SOQLResult JSON final_formatter produces. Bedrock does
+    not enforce tool-argument schemas, so they are validated here; arguments that do not
+    fit are passed on as their raw JSON.
+    """
+    try:
+        return SOQLResult.model_validate(emitted).model_dump_json()
+    except ValidationError:
+        return json.dumps(emitted, ensure_ascii=False)
+
+
+def _tool_payload(message: ToolMessage) -> Any:
+    """Decoded tool result (ToolNode serializes dict/list results to JSON strings)."""
+    content = message.content
+    if isinstance(content, str) and content[:1] in ("{", "["):
+        try:
+            return json.loads(content)
+        except ValueError:
+            return None
+    return content
+
+
+def _last_tool_results(messages: List[Any]) -> List[ToolMessage]:
+    """ToolMessages produced by the most recent tool turn."""
+    out: List[ToolMessage] = []
+    for m in reversed(messages):
+        if not isinstance(m, ToolMessage):
+            break
+        out.append(m)
+    return out
+
+
+def _successful_validation(messages: List[Any]) -> Optional[Dict[str, Any]]:
+    for m in _last_tool_results(messages):
+        if m.name == "validate_soql_tool" and getattr(m, "status", "success") == "success":
+            payload = _tool_payload(m)
+            if isinstance(payload, dict) and payload.get("valid"):
+                return payload
+    return None
+
+
+def route_after_tools(state: State):
+    """A valid validate_soql_tool result is final: format it locally instead of another LLM turn."""
+    if _successful_validation(state["messages"]):
+        return "final_formatter"
+    return "bot_manager"
+
+
+def final_formatter(state: State):
+    """Build the FINAL OUTPUT JSON from the validated SOQL and earlier tool results."""
+    messages = state["messages"]
+    validation = _successful_validation(messages) or {}
+
+    soql = validation.get("soql", "")
+    # Stage names are in the prompt rather than fetched by a tool: report the ones the SOQL uses
+    stage_names = [n for n in _stage_names(False) if f"'{n}'" in soql] if soql else []
+
+    notes = ""
+    for m in messages:
+        if not isinstance(m, ToolMessage):
+            continue
+        if m.name == "find_best_name_matches":
+            payload = _tool_payload(m)
+            if isinstance(payload, list) and payload and isinstance(payload[0], dict):
+                top = payload[0]
+                top_id = top.get("opportunity_id") or top.get("account_id") or ""
+                notes = f"Filtered on {top.get('type', 'record')} '{top.get('name', '')}' ({top_id})."
+
+    out = SOQLResult(
+        soql=soql,
+        approx_row_count=validation.get("count"),
+        resolved_stage_names=stage_names,
+        sample=validation.get("sample"),
+        notes=notes,
+    )
+    return {"messages": [AIMessage(content=out.model_dump_json())]}
+
+
 graph_builder = StateGraph(State, context_schema=AgentContext)
-graph_builder.add_node("bot_manager", bot_manager)
-graph_builder.add_node("tools", ToolNode(tools=tools))
+# Sync callers (invoke/stream) run bot_manager; async ones (ainvoke/astream) run abot_manager
+graph_builder.add_node("bot_manager", RunnableLambda(bot_manager, afunc=abot_manager))
+graph_builder.add_node("tools", ToolNode(tools=tools, handle_tool_errors=True))
+graph_builder.add_node("final_formatter", final_formatter)
 graph_builder.set_entry_point("bot_manager")
 graph_builder.add_conditional_edges("bot_manager", route_tools, {"tools": "tools", END: END})
-graph_builder.add_edge("tools", "bot_manager")
+graph_builder.add_conditional_edges(
+    "tools", route_after_tools, {"final_formatter": "final_formatter", "bot_manager": "bot_manager"}
+)
+graph_builder.add_edge("final_formatter", END)
 graph = graph_builder.compile()
 
+# Upper bound for tool calls the ToolNode runs side by side within one turn
+GRAPH_CONFIG: RunnableConfig = {"max_concurrency": 8}
+
 
 
 
@@ -505,25 +869,72 @@ def call_agent_generate_soql(
       - Otherwise:
           -> dict with keys { "output": ..., "trace": ..., "state": ... }
     """
-    user_message = HumanMessage(content=human_input)
-    state: State = cast(State, {"messages": [user_message]})
+    state = _initial_state(human_input)
 
     final_state: Optional[Dict[str, Any]] = None
     trace_text = ""
 
     if stream:
-        trace_chunks: List[str] = []
-        for s in graph.stream(state, stream_mode="values"):
+        # Each step only formats the messages added since the previous one
+        trace_lines: List[str] = []
+        seen = 0
+        for s in graph.stream(state, config=GRAPH_CONFIG, stream_mode="values"):
             final_state = s
             if with_trace:
-                trace_chunks.append(_trace_as_text(s))
+                trace_lines.extend(_trace_lines(s["messages"], seen))
+                seen = len(s["messages"])
         if with_trace:
-            trace_text = "\n".join(trace_chunks)
+            trace_text = _format_trace(trace_lines)
     else:
-        final_state = graph.invoke(state)
+        final_state = graph.invoke(state, config=GRAPH_CONFIG)
         if with_trace:
             trace_text = _trace_as_text(cast(Dict[str, Any], final_state))
 
+    return _agent_result(final_state, trace_text, with_trace=with_trace, return_state=return_state)
+
+
+async def acall_agent_generate_soql(
+    human_input: str,
+    *,
+    stream: bool = False,
+    with_trace: bool = False,
+    return_state: bool = False,
+) -> Union[str, Dict[str, Any]]:
+    """
+    Async twin of call_agent_generate_soql (same arguments and return shape).
+    Bedrock turns are awaited and the turn's tool calls run in worker threads,
+    so concurrent requests can share one event loop.
+    """
+    state = await _ainitial_state(human_input)
+
+    final_state: Optional[Dict[str, Any]] = None
+    trace_text = ""
+
+    if stream:
+        trace_lines: List[str] = []
+        seen = 0
+        async for s in graph.astream(state, config=GRAPH_CONFIG, stream_mode="values"):
+            final_state = s
+            if with_trace:
+                trace_lines.extend(_trace_lines(s["messages"], seen))
+                seen = len(s["messages"])
+        if with_trace:
+            trace_text = _format_trace(trace_lines)
+    else:
+        final_state = await graph.ainvoke(state, config=GRAPH_CONFIG)
+        if with_trace:
+            trace_text = _trace_as_text(cast(Dict[str, Any], final_state))
+
+    return _agent_result(final_state, trace_text, with_trace=with_trace, return_state=return_state)
+
+
+def _agent_result(
+    final_state: Optional[Dict[str, Any]],
+    trace_text: str,
+    *,
+    with_trace: bool,
+    return_state: bool,
+) -> Union[str, Dict[str, Any]]:
     # Extract final assistant content safely
     if not final_state:
         raise RuntimeError("graph.invoke() returned None")
@@ -531,9 +942,53 @@ def call_agent_generate_soql(
     messages = final_state["messages"]
 
     last_ai = next((m for m in reversed(messages) if isinstance(m, AIMessage)), None)
-    output = getattr(last_ai, "content", "") if last_ai else str(messages[-1].content or "")
+    emitted = _emitted_result(last_ai)
+    if emitted is not None:
+        output = _emitted_json(emitted)  # callers keep getting a JSON string
+    else:
+        output = getattr(last_ai, "content", "") if last_ai else str(messages[-1].content or "")
 
     if not with_trace and not return_state:
         return output
 
     return {"output": output, "trace": trace_text, "state": final_state if return_state else None}
+
+
+def _chunk_text(chunk: Any) -> str:
+    """Text part of a streamed AIMessageChunk (plain string or Bedrock content blocks)."""
+    content = getattr(chunk, "content", "")
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block.get("text", "")
+        for block in content
+        if isinstance(block, dict) and block.get("type") == "text"
+    )
+
+
+async def astream_agent_generate_soql(human_input: str) -> AsyncIterator[str]:
+    """
+    Run the agent and yield assistant text as Bedrock streams it, so the final JSON
+    starts arriving before the last turn has finished. Tool-call turns carry no text
+    and yield nothing; emit_result arguments and JSON built by final_formatter are
+    yielded in one piece.
+    """
+    state = await _ainitial_state(human_input)
+    async for event in graph.astream_events(state, config=GRAPH_CONFIG, version="v2"):
+        if event["event"] == "on_chain_end" and event.get("name") == "final_formatter":
+            output = event["data"].get("output") or {}
+            for m in output.get("messages", []):
+                yield str(m.content)
+            continue
+        if event["event"] == "on_chat_model_end" and event.get("metadata", {}).get("langgraph_node") == "bot_manager":
+            emitted = _emitted_result(event["data"].get("output"))
+            if emitted is not None:
+                yield _emitted_json(emitted)
+            continue
+        if event["event"] != "on_chat_model_stream":
+            continue
+        if event.get("metadata", {}).get("langgraph_node") != "bot_manager":
+            continue
+        text = _chunk_text(event["data"]["chunk"])
+        if text:
+            yield text
@@ -1,9 +1,21 @@
 # mcp_salesforce/core_schema.py
 from __future__ import annotations
 
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
 from functools import lru_cache
-from typing import Any, Dict, List, Optional, Tuple
-from simple_salesforce.api import SFType
+from operator import itemgetter
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, TypeVar
+from simple_salesforce.api import DEFAULT_API_VERSION, Salesforce
+from simple_salesforce.exceptions import SalesforceExpiredSession
 
 from mcp_salesforce import helpers  # uses helpers.get_sf_connection()
 
@@ -12,7 +24,18 @@ from mcp_salesforce import helpers  # uses helpers.get_sf_connection()
 # (Only fields that exist in your org will be included at runtime.)
 # -------------------------------------------------------------------
 
-FIELD_CANDIDATES: Dict[str, Dict[str, List[str]]] = {
+# (candidate API name, lowered) pairs: lowered once here, not on every lookup
+Candidates = Tuple[Tuple[str, str], ...]
+
+
+def _freeze(table: Dict[str, Dict[str, List[str]]]) -> Dict[str, Dict[str, Candidates]]:
+    return {
+        obj: {friendly: tuple((c, c.lower()) for c in cands) for friendly, cands in fields.items()}
+        for obj, fields in table.items()
+    }
+
+
+FIELD_CANDIDATES: Dict[str, Dict[str, Candidates]] = _freeze({
     "Opportunity": {
         "Opportunity.Id":            ["Id"],
         "Opportunity.Name":          ["Name"],
@@ -49,86 +72,470 @@ FIELD_CANDIDATES: Dict[str, Dict[str, List[str]]] = {
         "Account.RecordTypeId__c":   ["RecordTypeId__c"],     # custom string
         "Account.Customer_Type__c":  ["Customer_Type__c"],    # picklist (custom)
     },
-}
+})
 
 
 # -------------------------------------------------------------------
 # Helpers to normalize describe() field → compact schema
 # -------------------------------------------------------------------
 
-def _find(desc: Dict[str, Any], candidates: List[str]) -> Optional[Dict[str, Any]]:
-    """Return the first field from `desc` whose API name matches any candidate."""
+def _field_maps(desc: Dict[str, Any]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """
+    (API name → field, lowered API name → field) for one describe(); build once per describe.
+    The lowered map starts empty and is only filled by _find when a strict match fails.
+    """
     by_name = {f["name"]: f for f in desc.get("fields", []) or []}
-    for c in candidates:
+    return by_name, {}
+
+
+def _find(
+    by_name: Dict[str, Dict[str, Any]],
+    lowered: Dict[str, Dict[str, Any]],
+    candidates: Candidates,
+) -> Optional[Dict[str, Any]]:
+    """Return the first field whose API name matches any candidate (see _field_maps)."""
+    for c, _ in candidates:
         if c in by_name:
             return by_name[c]
-    # case-insensitive fallback
-    lowered = {k.lower(): v for k, v in by_name.items()}
-    for c in candidates:
-        f = lowered.get(c.lower())
+    # case-insensitive fallback; the lowered map is built on first use, once per describe
+    if not lowered:
+        lowered.update((k.lower(), v) for k, v in by_name.items())
+    for _, c_lower in candidates:
+        f = lowered.get(c_lower)
         if f:
             return f
     return None
 
 
+_PICKLIST_VALUE = itemgetter("value")
+
+# One shared tuple per distinct picklist value set / reference list across the index
+_INTERNED: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _intern_tuple(t: Tuple[str, ...]) -> Tuple[str, ...]:
+    return _INTERNED.setdefault(t, t)
+
+
+def _is_active(pv: Dict[str, Any]) -> bool:
+    return bool(pv.get("active", True))
+
+
 def _schema_entry(f: Dict[str, Any]) -> Dict[str, Any]:
     """Compact, token-light schema snapshot for one field."""
+    get = f.get
+    ftype = get("type")
+    refs = get("referenceTo")
+    rel = get("relationshipName")
     out: Dict[str, Any] = {
         "api":         f["name"],
-        "label":       f.get("label"),
-        "type":        f.get("type"),
-        "filterable":  bool(f.get("filterable")),
-        "sortable":    bool(f.get("sortable")),
+        "label":       get("label"),
+        "type":        ftype,
+        "filterable":  bool(get("filterable")),
+        "sortable":    bool(get("sortable")),
     }
-    if f.get("type") in ("picklist", "multipicklist"):
-        out["values"] = [pv["value"] for pv in f.get("picklistValues", []) if pv.get("active", True)]
-    if f.get("referenceTo"):
-        out["references"] = list(f.get("referenceTo") or [])
-    if f.get("relationshipName"):
-        out["relationshipName"] = f["relationshipName"]
+    if ftype == "picklist" or ftype == "multipicklist":
+        out["values"] = _intern_tuple(tuple(map(_PICKLIST_VALUE, filter(_is_active, get("picklistValues") or ()))))
+    if refs:
+        out["references"] = _intern_tuple(tuple(refs))
+    if rel:
+        out["relationshipName"] = rel
     return out
 
 
+# -------------------------------------------------------------------
+# Cache statistics (see get_cache_stats)
+# -------------------------------------------------------------------
+
+_stats: Dict[str, Any] = {"hits": 0, "misses": 0, "refreshes": 0, "not_modified": 0, "last_build_ms": 0.0}
+_stats_lock = threading.Lock()
+
+
+def _bump(counter: str) -> None:
+    with _stats_lock:
+        _stats[counter] += 1
+
+
 # -------------------------------------------------------------------
 # Build dynamic allow-list index using describe()
 # -------------------------------------------------------------------
 
-@lru_cache(maxsize=1)
-def build_core_field_index_cached() -> Dict[str, Dict[str, Any]]:
+_T = TypeVar("_T")
+
+
+def _with_sf(call: Callable[[Salesforce], _T]) -> _T:
     """
-    Resolve FIELD_CANDIDATES against your org’s schema and return:
-      { "<FriendlyName>": {api, label, type, filterable, sortable, [values], [references], [relationshipName] }, ... }
-    Only fields that actually exist in your org are included.
+    Run `call` on the shared connection; if its session has expired, log in again and
+    retry once (helpers.retry_on_expired_session is not defined yet while this module loads).
     """
     sf = helpers.get_sf_connection()
+    try:
+        return call(sf)
+    except SalesforceExpiredSession:
+        helpers.reset_sf_connection(sf)  # no-op if another thread already logged in again
+        return call(helpers.get_sf_connection())
 
-    opportunity = SFType("Opportunity", sf.session_id, sf.sf_instance)
-    account = SFType("Account", sf.session_id, sf.sf_instance)
 
-    opp_desc = opportunity.describe()
-    acc_desc = account.describe()
+def _describe(sf: Salesforce, object_api: str, since: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    GET sobjects/<object>/describe, conditional on `since` (an RFC 7231 date from a
+    previous Last-Modified). Returns (describe or None on 304 Not Modified, Last-Modified).
+    """
+    headers = dict(sf.headers)
+    if since:
+        headers["If-Modified-Since"] = since
+    url = f"{sf.base_url}sobjects/{object_api}/describe"
+    resp = sf.session.get(url, headers=headers)
+    if resp.status_code == 304:
+        return None, since
+    if resp.status_code == 401:  # a raw GET skips simple_salesforce's own error mapping
+        raise SalesforceExpiredSession(url, resp.status_code, object_api, resp.content)
+    resp.raise_for_status()
+    return resp.json(), resp.headers.get("Last-Modified")
 
-    idx: Dict[str, Dict[str, Any]] = {}
 
-    def add(object_desc: Dict[str, Any], friendly: str, candidates: List[str]) -> None:
-        f = _find(object_desc, candidates)
+# Describes fetched ahead of time by _prefetch_describes, consumed once by _build_object_index
+_prefetched: Dict[str, Tuple[Dict[str, Any], Optional[str]]] = {}
+
+
+def _prefetch_describes(sf: Salesforce, objects: List[str]) -> None:
+    """
+    Describe several objects in ONE composite/batch round-trip instead of one GET each.
+    Batch sub-responses carry no headers, so the fetch time stands in for Last-Modified
+    (later revalidations stay conditional). Objects that fail here are simply described
+    on their own by _build_object_index.
+    """
+    fetched_at = formatdate(usegmt=True)
+    batch = {"batchRequests": [
+        {"method": "GET", "url": f"v{sf.sf_version}/sobjects/{obj}/describe"} for obj in objects
+    ]}
+    try:
+        results = sf.restful("composite/batch", method="POST", data=json.dumps(batch))["results"]
+    except SalesforceExpiredSession:
+        raise  # see _with_sf
+    except Exception:
+        return
+    for obj, res in zip(objects, results):
+        if res.get("statusCode") == 200:
+            _prefetched[obj] = (res["result"], fetched_at)
+
+
+def _prompt_line(friendly: str, entry: Dict[str, Any]) -> str:
+    """Compact one-line form for LLM prompts, e.g. 'Account.Type(picklist,values=[A,B])'."""
+    values = f",values=[{','.join(entry['values'])}]" if "values" in entry else ""
+    return f"{friendly}({entry['type']}{values})"
+
+
+def _build_object_index(object_api: str, since: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Uncached describe() → allow-list pipeline for ONE object (see _object_index).
+    With `since` (Last-Modified of a previous build) the describe is conditional;
+    returns None when the object has not changed.
+    """
+    started = time.perf_counter()
+    prefetched = _prefetched.pop(object_api, None) if since is None else None
+    if prefetched is not None:
+        desc, last_modified = prefetched
+    else:
+        desc, last_modified = _with_sf(lambda sf: _describe(sf, object_api, since))
+    if desc is None:
+        _bump("not_modified")
+        return None  # 304: the previous build is still current
+
+    by_name, lowered = _field_maps(desc)
+
+    idx: Dict[str, Dict[str, Any]] = {}
+    for friendly, candidates in FIELD_CANDIDATES[object_api].items():
+        f = _find(by_name, lowered, candidates)
         if f:
-            idx[friendly] = _schema_entry(f)
+            entry = _schema_entry(f)
+            entry["_object"] = object_api  # saves resolve_object_and_api a split(".")
+            entry["_prompt"] = _prompt_line(friendly, entry)
+            idx[friendly] = entry
+
+    _stats["last_build_ms"] = (time.perf_counter() - started) * 1000.0
+    # Detail SELECT list, de-duplicated in index order
+    detail_list = tuple(dict.fromkeys(entry["api"] for entry in idx.values()))
+    return {"idx": idx, "detail_list": detail_list, "last_modified": last_modified}
+
+
+# -------------------------------------------------------------------
+# On-disk cache (stale-while-revalidate) so restarts skip describe()
+# -------------------------------------------------------------------
+
+# Bump when the shape of the cached object index changes so old files are ignored
+_DISK_CACHE_FORMAT = 1
+
+# One file per object, derived from this path (core_describe.Account.pkl, ...)
+DISK_CACHE_PATH = Path(
+    os.getenv("MCP_SF_SCHEMA_CACHE_FILE", "~/.cache/mcp_salesforce/core_describe.pkl")
+).expanduser()
+DISK_CACHE_TTL = float(os.getenv("MCP_SF_SCHEMA_CACHE_TTL", "86400"))  # seconds
+
+
+def _disk_cache_path(object_api: str) -> Path:
+    return DISK_CACHE_PATH.with_name(f"{DISK_CACHE_PATH.stem}.{object_api}{DISK_CACHE_PATH.suffix}")
+
+
+def _disk_cache_key() -> Tuple[Any, ...]:
+    """Org identity + API version (+ file format), known without logging in."""
+    return (
+        _DISK_CACHE_FORMAT,
+        os.getenv("SALESFORCE_DOMAIN") or "login",
+        os.getenv("SALESFORCE_USERNAME") or "",
+        DEFAULT_API_VERSION,
+    )
+
+
+def _read_disk_cache(object_api: str) -> Optional[Dict[str, Any]]:
+    try:
+        with _disk_cache_path(object_api).open("rb") as fh:
+            payload = pickle.load(fh)
+    except (OSError, pickle.PickleError, EOFError, AttributeError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("key") != _disk_cache_key():
+        return None  # other org / API version
+    return payload
+
+
+def _write_disk_cache(object_api: str, index: Dict[str, Any]) -> None:
+    payload = {"generated_at": time.time(), "key": _disk_cache_key(), "index": index}
+    path = _disk_cache_path(object_api)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            pickle.dump(payload, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)  # atomic: readers never see a partial file
+    except OSError:
+        pass  # the disk cache is best effort
+
+
+def _clear_derived_caches() -> None:
+    """Views computed from the object slices; dropped whenever a slice is swapped."""
+    global _combined
+    _combined = None
+    _lowered_attribute_index.cache_clear()
+    _lookup.cache_clear()
+    _resolve_object_and_api.cache_clear()
+
+
+def _revalidate(object_api: str) -> Dict[str, Any]:
+    """Conditional describe against the disk copy; rewrites the disk copy either way."""
+    _bump("refreshes")
+    previous = _read_disk_cache(object_api)
+    since = previous["index"].get("last_modified") if previous else None
+    index = _build_object_index(object_api, since)
+    if index is None:
+        index = previous["index"]  # 304: just restart the TTL
+    _write_disk_cache(object_api, index)
+    return index
+
+
+def _read_only(index: Dict[str, Any]) -> Mapping[str, Any]:
+    """
+    Zero-copy read-only view of an object slice (schema entries included), safe to share
+    across threads and callers. The plain dicts underneath are what gets pickled.
+    """
+    idx = MappingProxyType({k: MappingProxyType(v) for k, v in index["idx"].items()})
+    return MappingProxyType({**index, "idx": idx})
+
+
+# -------------------------------------------------------------------
+# In-memory cache with a TTL (stale-while-revalidate after TTL/2)
+# -------------------------------------------------------------------
+
+SCHEMA_TTL = float(os.getenv("MCP_SF_SCHEMA_TTL", "3600"))  # seconds
+
+
+class _CachedResult:
+    """One object slice plus when it was produced; swapped under `lock`."""
+
+    __slots__ = ("value", "generated_at", "refreshing", "lock")
+
+    def __init__(self) -> None:
+        self.value: Optional[Mapping[str, Any]] = None
+        self.generated_at = 0.0
+        self.refreshing = False
+        self.lock = threading.RLock()  # re-entered when a first load starts a refresh
+
+    def store(self, index: Dict[str, Any]) -> None:
+        self.value = _read_only(index)
+        self.generated_at = time.time()
+        _clear_derived_caches()
 
-    # Opportunity
-    for friendly, candidates in FIELD_CANDIDATES["Opportunity"].items():
-        add(opp_desc, friendly, candidates)
 
-    # Account
-    for friendly, candidates in FIELD_CANDIDATES["Account"].items():
-        add(acc_desc, friendly, candidates)
+_object_cache: Dict[str, _CachedResult] = {obj: _CachedResult() for obj in FIELD_CANDIDATES}
 
-    return idx
+
+def _load_object_index(object_api: str) -> Dict[str, Any]:
+    """First load: the disk copy if there is one (revalidated in the background once it is
+    older than DISK_CACHE_TTL), else a full describe."""
+    payload = _read_disk_cache(object_api)
+    if payload is not None:
+        if time.time() - payload.get("generated_at", 0) >= DISK_CACHE_TTL:
+            _start_background_refresh(object_api)
+        return payload["index"]
+
+    index = _build_object_index(object_api)
+    _write_disk_cache(object_api, index)
+    return index
+
+
+def _background_refresh(object_api: str) -> None:
+    holder = _object_cache[object_api]
+    try:
+        index = _revalidate(object_api)
+        with holder.lock:
+            holder.store(index)
+    except Exception:
+        pass  # keep serving the current copy
+    finally:
+        holder.refreshing = False
+
+
+def _start_background_refresh(object_api: str) -> None:
+    holder = _object_cache[object_api]
+    with holder.lock:
+        if holder.refreshing:
+            return  # a refresh is already running
+        holder.refreshing = True
+    threading.Thread(target=_background_refresh, args=(object_api,), daemon=True).start()
+
+
+def _object_index(object_api: str) -> Mapping[str, Any]:
+    """
+    Allow-list slice for one object:
+      {
+        "idx": { "<FriendlyName>": {api, label, type, filterable, sortable, [values], [references], [relationshipName] }, ... },
+        "detail_list": ("<ApiField>", ...),  # de-duplicated, index order
+        "last_modified": "<Last-Modified header>",
+      }
+    Only this object is described, so single-object callers never pay for the others.
+
+    Kept in memory for SCHEMA_TTL: past TTL/2 the current copy is served while a daemon
+    thread revalidates it; past TTL the caller waits for the revalidation.
+    """
+    holder = _object_cache[object_api]
+    age = time.time() - holder.generated_at
+    if holder.value is None or age > SCHEMA_TTL:
+        with holder.lock:
+            # Re-check: another thread may have refreshed while we waited for the lock
+            if holder.value is None:
+                _bump("misses")
+                holder.store(_load_object_index(object_api))
+            elif time.time() - holder.generated_at > SCHEMA_TTL:
+                _bump("misses")
+                holder.store(_revalidate(object_api))
+            else:
+                _bump("hits")
+            value = holder.value
+        return value
+    _bump("hits")
+    if age > SCHEMA_TTL / 2 and not holder.refreshing:
+        _start_background_refresh(object_api)
+    return holder.value
+
+
+# Combined view over all objects; built by one thread at a time (see below)
+_combined: Optional[Mapping[str, Any]] = None
+_build_lock = threading.Lock()
+
+
+def build_core_field_index_cached() -> Mapping[str, Any]:
+    """
+    Resolve FIELD_CANDIDATES against your org’s schema and return:
+      {
+        "idx": { "<FriendlyName>": {api, label, type, filterable, sortable, [values], [references], [relationshipName] }, ... },
+        "sorted_names": ("<FriendlyName>", ...),  # sorted idx keys
+        "prompt": "<one _prompt line per attribute, sorted>",
+      }
+    Per-object detail SELECT lists live on _object_index(<Object>)["detail_list"].
+    Everything returned is read-only (MappingProxyType); copy before mutating.
+    Only fields that actually exist in your org are included.
+
+    Single-flight: concurrent cold callers wait for one build instead of each
+    describing the org (the per-object slices are single-flight as well).
+    """
+    global _combined
+    _expire_stale_slices()
+    combined = _combined
+    if combined is not None:
+        return combined
+    with _build_lock:
+        combined = _combined  # re-check: another thread may have built it while we waited
+        if combined is None:
+            combined = _combined = _build_combined()
+        return combined
+
+
+def _build_combined() -> Mapping[str, Any]:
+    # Objects that will need a full describe (nothing in memory or on disk): one batch call
+    cold = [
+        obj for obj in FIELD_CANDIDATES
+        if _object_cache[obj].value is None and not _disk_cache_path(obj).exists()
+    ]
+    if len(cold) > 1:
+        _with_sf(lambda sf: _prefetch_describes(sf, cold))
+
+    # Independent per-object builds (HTTPS describes on a cold cache): run them side by side
+    with ThreadPoolExecutor(max_workers=len(FIELD_CANDIDATES)) as ex:
+        slices = dict(zip(FIELD_CANDIDATES, ex.map(_object_index, FIELD_CANDIDATES)))
+
+    idx: Dict[str, Mapping[str, Any]] = {}
+    for obj_slice in slices.values():
+        idx.update(obj_slice["idx"])
+    sorted_names = tuple(sorted(idx))
+    return MappingProxyType({
+        "idx": MappingProxyType(idx),
+        "sorted_names": sorted_names,
+        "prompt": "\n".join(idx[name]["_prompt"] for name in sorted_names),
+    })
+
+
+def _expire_stale_slices() -> None:
+    """
+    Apply SCHEMA_TTL ahead of the derived caches (_combined and the lru-cached lookups),
+    which answer without going through _object_index: a slice past TTL is revalidated
+    now, one past TTL/2 in the background. Swapping a slice clears the derived caches.
+    """
+    now = time.time()
+    for obj, holder in _object_cache.items():
+        if holder.value is None:
+            continue  # never loaded: nothing derived from it yet
+        age = now - holder.generated_at
+        if age > SCHEMA_TTL:
+            _object_index(obj)
+        elif age > SCHEMA_TTL / 2 and not holder.refreshing:
+            _start_background_refresh(obj)
+
+
+@lru_cache(maxsize=8)
+def _lowered_attribute_index(object_api: str) -> Dict[str, Tuple[str, Mapping[str, Any]]]:
+    """
+    { lowered friendly suffix or API name: (friendly attr, schema) } for one object.
+    The first attribute (index order) claiming a key wins, like a linear scan would.
+    """
+    out: Dict[str, Tuple[str, Mapping[str, Any]]] = {}
+    if object_api not in FIELD_CANDIDATES:
+        return out
+    for attr, schema in _object_index(object_api)["idx"].items():
+        suffix = attr.split(".", 1)[1]
+        out.setdefault(suffix.lower(), (attr, schema))
+        out.setdefault((schema.get("api") or "").lower(), (attr, schema))
+    return out
 
 
 def refresh_core_field_cache() -> None:
-    """Clear the LRU cache. Call after metadata changes."""
-    build_core_field_index_cached.cache_clear()  # type: ignore[attr-defined]
+    """Expire the in-memory copies and delete the on-disk ones. Call after metadata changes."""
+    for obj in FIELD_CANDIDATES:
+        try:
+            _disk_cache_path(obj).unlink()
+        except FileNotFoundError:
+            pass
+        _object_cache[obj].generated_at = 0.0  # next access re-describes
+    _prefetched.clear()
+    _clear_derived_caches()
 
 
 # -------------------------------------------------------------------
@@ -137,15 +544,51 @@ def refresh_core_field_cache() -> None:
 
 def list_allowed_attribute_names() -> List[str]:
     """Stable, sorted list of friendly attribute names allowed for SOQL & details."""
-    return sorted(build_core_field_index_cached().keys())
+    return list(build_core_field_index_cached()["sorted_names"])
 
 
-def get_schema_for_attribute(friendly_attr: str) -> Optional[Dict[str, Any]]:
+@lru_cache(maxsize=256)
+def _lookup(friendly_attr: str) -> Optional[Mapping[str, Any]]:
+    # Also remembers misses: LLM tool loops tend to repeat the same made-up names
+    obj = friendly_attr.split(".", 1)[0]
+    if obj not in FIELD_CANDIDATES:
+        return None
+    return _object_index(obj)["idx"].get(friendly_attr)
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Snapshot of the object-index cache counters:
+      hits / misses      — _object_index calls served from memory vs. that had to load or revalidate
+      refreshes          — revalidations (background or blocking)
+      not_modified       — revalidations answered 304
+      last_build_ms      — duration of the last describe + index build
     """
-    Return the compact schema dict for a friendly attr like 'Account.Type' or 'Opportunity.StageName'.
+    with _stats_lock:
+        return dict(_stats)
+
+
+def get_prompt_schema() -> str:
+    """The allow-list with types and picklist values, one compact line per attribute, for LLM prompts."""
+    return build_core_field_index_cached()["prompt"]
+
+
+def get_schema_for_attribute(friendly_attr: str) -> Optional[Mapping[str, Any]]:
+    """
+    Return the compact (read-only) schema for a friendly attr like 'Account.Type' or 'Opportunity.StageName'.
     Returns None if not available in this org.
     """
-    return build_core_field_index_cached().get(friendly_attr)
+    _expire_stale_slices()
+    return _lookup(friendly_attr)
+
+
+def find_attribute(object_api: str, field: str) -> Optional[Tuple[str, Mapping[str, Any]]]:
+    """
+    Case-insensitive lookup of a field on `object_api` by friendly suffix or API name.
+    Returns (friendly attr, schema) or None if it is not in the allow-list.
+    """
+    _expire_stale_slices()
+    return _lowered_attribute_index(object_api).get(field.lower())
 
 
 def resolve_object_and_api(friendly_attr: str) -> Optional[Tuple[str, str]]:
@@ -153,11 +596,14 @@ def resolve_object_and_api(friendly_attr: str) -> Optional[Tuple[str, str]]:
     Convert 'Account.Type' → ('Account', 'Type') using the resolved API from describe().
     Returns None if the friendly name is unknown.
     """
-    schema = get_schema_for_attribute(friendly_attr)
-    if not schema:
-        return None
-    obj = friendly_attr.split(".", 1)[0]
-    return obj, schema["api"]
+    _expire_stale_slices()
+    return _resolve_object_and_api(friendly_attr)
+
+
+@lru_cache(maxsize=256)
+def _resolve_object_and_api(friendly_attr: str) -> Optional[Tuple[str, str]]:
+    schema = _lookup(friendly_attr)
+    return (schema["_object"], schema["api"]) if schema else None
 
 
 def detail_select_list(object_api: str) -> List[str]:
@@ -165,21 +611,11 @@ def detail_select_list(object_api: str) -> List[str]:
     For a given object ('Account' or 'Opportunity'), return the *actual* API fields to SELECT for details,
     filtered to those that exist in this org.
     """
-    idx = build_core_field_index_cached()
-    prefix = f"{object_api}."
-    out: List[str] = []
-    for friendly, schema in idx.items():
-        if friendly.startswith(prefix):
-            out.append(schema["api"])  # actual field API
-    # de-dup while preserving order
-    seen = set()
-    uniq = []
-    for a in out:
-        if a in seen:
-            continue
-        seen.add(a)
-        uniq.append(a)
-    return uniq
+    # Object → API list precomputed per object build: a dict hit, no prefix scan.
+    # A fresh list because callers extend it.
+    if object_api not in FIELD_CANDIDATES:
+        return []
+    return list(_object_index(object_api)["detail_list"])
 
 
 if __name__ == "__main__":
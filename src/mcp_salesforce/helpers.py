@@ -1,8 +1,16 @@
+import csv
+import functools
+import io
 import json
+import logging
 import os
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from simple_salesforce.api import Salesforce
+from simple_salesforce.exceptions import SalesforceExpiredSession
 from typing import Any, Dict, List, Optional, Iterable, Tuple, Union
 import mcp_salesforce.core_schema as core_schema
 import mcp_common.utils.bedrock_wrapper as bedrock_wrapper
@@ -15,8 +23,54 @@ from difflib import SequenceMatcher
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# One logged-in connection per process; built lazily, rebuilt after reset_sf_connection()
+_SF_SINGLETON: Optional[Salesforce] = None
+_SF_LOCK = threading.Lock()
+
+
 def get_sf_connection() -> Salesforce:
-    """Create and return a Salesforce connection from environment variables."""
+    """
+    Shared Salesforce connection built from environment variables.
+    The SOAP login happens once; later calls reuse the session.
+    """
+    global _SF_SINGLETON
+    sf = _SF_SINGLETON
+    if sf is not None:
+        return sf
+    with _SF_LOCK:
+        if _SF_SINGLETON is None:  # re-check: another thread may have logged in meanwhile
+            _SF_SINGLETON = _new_sf_connection()
+        return _SF_SINGLETON
+
+
+def reset_sf_connection(failed: Optional[Salesforce] = None) -> None:
+    """
+    Drop the shared connection; the next get_sf_connection() logs in again.
+    With `failed`, only drop it if it is still that instance: when several calls hit the
+    same expired session, the first one re-logs in and the others reuse its connection.
+    """
+    global _SF_SINGLETON
+    with _SF_LOCK:
+        if failed is None or _SF_SINGLETON is failed:
+            _SF_SINGLETON = None
+
+
+def retry_on_expired_session(fn):
+    """Run `fn`; if the shared session has expired, log in again and retry once."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        used = _SF_SINGLETON  # the connection `fn` will pick up (None: it logs in itself)
+        try:
+            return fn(*args, **kwargs)
+        except SalesforceExpiredSession:
+            reset_sf_connection(used)
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def _new_sf_connection() -> Salesforce:
     username = os.getenv("SALESFORCE_USERNAME")
     password = os.getenv("SALESFORCE_PASSWORD")
     security_token = os.getenv("SALESFORCE_SECURITY_TOKEN")
@@ -46,22 +100,31 @@ def _escape_soql_literal(s: str) -> str:
 def _flatten_record(rec: Dict[str, Any]) -> Dict[str, Any]:
     """Flatten relationship sub-objects into dot-keys (Owner.Name → 'Owner.Name')."""
     out: Dict[str, Any] = {}
-    for k, v in rec.items():
-        if k == "attributes":
-            continue
-        if isinstance(v, dict) and "attributes" in v:
-            sub = _flatten_record(v)
-            for sk, sv in sub.items():
-                out[f"{k}.{sk}"] = sv
+    # (key prefix, remaining items) per open level; a sub-object is walked as soon as it
+    # is met, so keys come out in the same order as a recursive walk would give
+    stack = [("", iter(rec.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for k, v in items:
+            if k == "attributes":
+                continue
+            key = prefix + k
+            if isinstance(v, dict) and "attributes" in v:
+                stack.append((key + ".", iter(v.items())))
+                break
+            out[key] = v
         else:
-            out[k] = v
+            stack.pop()
     return out
 
 
 
 
 def _strip_attributes(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    return [{k: v for k, v in r.items() if k != "attributes"} for r in records]
+    """Drop each record's 'attributes' IN PLACE (records are fresh API responses) and return the list."""
+    for r in records:
+        r.pop("attributes", None)
+    return records
 
 
 def _norm(s: str) -> str:
@@ -127,6 +190,23 @@ def _pp_json(obj: Any) -> str:
         return str(obj)
 
 
+def _iter_query_pages(sf: Salesforce, first: Dict[str, Any]) -> Iterable[Dict[str, Any]]:
+    """
+    Yield `first` and every following page of a query result. The next page is
+    requested while the caller is still consuming the current one.
+    """
+    ex = ThreadPoolExecutor(max_workers=1)
+    try:
+        page: Optional[Dict[str, Any]] = first
+        while page is not None:
+            next_url = page.get("nextRecordsUrl")
+            nxt = ex.submit(sf.query_more, next_url, identifier_is_url=True) if next_url else None
+            yield page
+            page = nxt.result() if nxt else None
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)  # caller stopped early: drop the prefetch
+
+
 def _maybe_json_load(s: str):
     try:
         return json.loads(s)
@@ -135,6 +215,55 @@ def _maybe_json_load(s: str):
 
 
 
+# Bulk API 2.0 CSV text → the JSON types query_all returns, by describe() field type
+_BULK_CASTS = {
+    "boolean": lambda v: v == "true",
+    "int": int,
+    "double": float,
+    "currency": float,
+    "percent": float,
+    # REST writes the UTC offset as +0000, Bulk CSV as Z
+    "datetime": lambda v: v[:-1] + "+0000" if v.endswith("Z") else v,
+}
+_FIELD_TYPES: Dict[str, Dict[str, str]] = {}  # object → {field: describe type}; static metadata
+
+
+def _field_types(sf: Salesforce, object_api: str) -> Dict[str, str]:
+    types = _FIELD_TYPES.get(object_api)
+    if types is None:
+        fields = getattr(sf, object_api).describe()["fields"]
+        types = _FIELD_TYPES[object_api] = {f["name"]: f["type"] for f in fields}
+    return types
+
+
+def _query_all_records(sf: Salesforce, object_api: str, soql: str) -> List[Dict[str, Any]]:
+    """
+    Full-table extract via Bulk API 2.0 (a few large CSV responses instead of one
+    REST call per 2000 rows). Falls back to query_all when Bulk API is unavailable.
+    Either way rows come back in the same shape: flat dicts keyed by field
+    ("Account.Name" for relationship fields), no 'attributes', JSON-typed values
+    (bool/int/float, None for empty; see _BULK_CASTS).
+    """
+    try:
+        types = _field_types(sf, object_api)
+        rows: List[Dict[str, Any]] = []
+        for chunk in getattr(sf.bulk2, object_api).query(soql):
+            reader = csv.DictReader(io.StringIO(chunk))
+            casts = [(name, _BULK_CASTS.get(types.get(name, ""))) for name in reader.fieldnames or ()]
+            for row in reader:
+                out: Dict[str, Any] = {}
+                for name, cast in casts:
+                    v = row[name]
+                    out[name] = None if v == "" else cast(v) if cast else v
+                rows.append(out)
+        return rows
+    except SalesforceExpiredSession:
+        raise
+    except Exception as e:
+        logger.warning("Bulk API 2.0 query on %s failed, falling back to query_all: %s", object_api, e)
+        return [_flatten_record(r) for r in sf.query_all(soql).get("records", [])]
+
+
 def fetch_accounts_and_opportunities(
     sf: Salesforce,
     account_fields=None,
@@ -155,7 +284,11 @@ def fetch_accounts_and_opportunities(
     Returns
     -------
     tuple[list[dict], list[dict]]
-        (accounts, opportunities)
+        (accounts, opportunities). Each row is a flat dict keyed by field name, without
+        'attributes'. Values keep their Salesforce JSON types: str for text, ids,
+        picklists and dates, "...+0000" strings for datetimes, float for currency and
+        numbers, bool for checkboxes, and None for empty fields. This holds whether the
+        rows came through Bulk API 2.0 or the query_all fallback.
     """
     if account_fields is None:
         account_fields = ["Id", "Name", "Type", "Industry", "BillingCountry", "OwnerId", "CreatedDate", "LastModifiedDate"]
@@ -166,12 +299,12 @@ def fetch_accounts_and_opportunities(
     account_query = f"SELECT {', '.join(account_fields)} FROM Account"
     opp_query = f"SELECT {', '.join(opportunity_fields)} FROM Opportunity"
 
-    # query_all will follow nextRecordsUrl under the hood and return the full set
-    accounts_result = sf.query_all(account_query)
-    opportunities_result = sf.query_all(opp_query)
-
-    accounts = _strip_attributes(accounts_result.get("records", []))
-    opportunities = _strip_attributes(opportunities_result.get("records", []))
+    # Bulk API 2.0 extracts (query_all fallback); the two objects are independent,
+    # so run both at the same time
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        fa = ex.submit(_query_all_records, sf, "Account", account_query)
+        fo = ex.submit(_query_all_records, sf, "Opportunity", opp_query)
+        accounts, opportunities = fa.result(), fo.result()
 
     return accounts, opportunities
 
@@ -205,8 +338,7 @@ def _friendly_to_select_expr(object_api: str, friendly_attr: str) -> Optional[st
     sch = core_schema.get_schema_for_attribute(friendly_attr)
     if not sch:
         return None
-    # friendly_attr is "<Obj>.<Suffix>"
-    obj, _ = friendly_attr.split(".", 1)
+    obj = sch["_object"]  # object the friendly attr lives on
     api = sch.get("api")
     if not api:
         return None
@@ -225,6 +357,7 @@ def _friendly_to_select_expr(object_api: str, friendly_attr: str) -> Optional[st
 
 
 
+@retry_on_expired_session
 def _find_best_name_matches(
     query: str,
     k: int = 5,
@@ -281,6 +414,8 @@ def _find_best_name_matches(
                     "name": record['Name'],
                     "type": "Opportunity"
                 })
+    except SalesforceExpiredSession:
+        raise
     except Exception as e:
         print(f"An error occurred during Salesforce data retrieval: {e}")
         return []
@@ -376,6 +511,9 @@ def _lookup_owner_name(sf, owner_id: str) -> Optional[str]:
     """Try User then Group; return Name or None."""
     if not owner_id:
         return None
+    cached = _cached_owner_name((_owner_kind(owner_id), owner_id))
+    if cached:
+        return cached
     for obj in ("User", "Group"):
         try:
             q = f"SELECT Id, Name FROM {obj} WHERE Id = '{_escape_soql_literal(owner_id)}' LIMIT 1"
@@ -387,6 +525,7 @@ def _lookup_owner_name(sf, owner_id: str) -> Optional[str]:
     return None
 
 
+@retry_on_expired_session
 def fetch_entity_details_tool(id_or_name: str) -> Dict[str, Any]:
     """
     Fetch a SINGLE Account or Opportunity by Salesforce Id ONLY (no names).
@@ -476,6 +615,8 @@ def fetch_entity_details_tool(id_or_name: str) -> Dict[str, Any]:
             try:
                 res = sf.query(soql)
                 recs = res.get("records") or []
+            except SalesforceExpiredSession:
+                raise
             except Exception as e:
                 return {"error": str(e), "input": id_or_name, "soql": soql}
 
@@ -537,21 +678,14 @@ def fetch_entity_details_tool(id_or_name: str) -> Dict[str, Any]:
                     q = f"SELECT Id, Name FROM Opportunity WHERE AccountId = '{_escape_soql_literal(acct_id)}' ORDER BY LastModifiedDate DESC"
                     res = sf.query(q)
                     total = int(res.get("totalSize", 0))
-                    recs = res.get("records") or []
-                    for r in recs:
-                        items.append({"id": r.get("Id"), "name": r.get("Name")})
-                        if len(items) >= MAX_ROWS:
-                            break
                     # paginate if needed and under cap
-                    next_url = res.get("nextRecordsUrl")
-                    while next_url and len(items) < MAX_ROWS:
-                        res = sf.query_more(next_url, identifier_is_url=True)
-                        recs = res.get("records") or []
-                        for r in recs:
+                    for page in _iter_query_pages(sf, res):
+                        for r in page.get("records") or []:
                             items.append({"id": r.get("Id"), "name": r.get("Name")})
                             if len(items) >= MAX_ROWS:
                                 break
-                        next_url = res.get("nextRecordsUrl")
+                        if len(items) >= MAX_ROWS:
+                            break
                 except Exception:
                     # keep whatever we gathered
                     pass
@@ -567,53 +701,90 @@ def fetch_entity_details_tool(id_or_name: str) -> Dict[str, Any]:
         # If we got here, the Id didn't return a record for its expected object.
         return {"error": f"No {candidate_objs[0]} found for given Id.", "input": id_or_name}
 
+    except SalesforceExpiredSession:
+        raise
     except Exception as e:
         return {"error": str(e), "input": id_or_name}
 
 
 
 
+# (kind, id) → Name; owner names change rarely, so resolved ids are kept across calls.
+# Only found names are cached: an id without a row is asked again next time.
+# Tool calls run in parallel threads, so every access holds _OWNER_NAME_LOCK.
+_OWNER_NAME_CACHE_SIZE = 4096
+_OWNER_NAME_CACHE: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+_OWNER_NAME_LOCK = threading.Lock()
+_OWNER_KINDS = {"005": "User", "00G": "Group"}
+
+
+def _owner_kind(owner_id: str) -> str:
+    # Unknown prefixes are tried as Group (queues and the like), as before.
+    return _OWNER_KINDS.get(owner_id[:3], "Group")
+
+
+def _cached_owner_name(key: Tuple[str, str]) -> Optional[str]:
+    with _OWNER_NAME_LOCK:
+        name = _OWNER_NAME_CACHE.get(key)
+        if name is not None:
+            _OWNER_NAME_CACHE.move_to_end(key)
+        return name
+
+
+def _remember_owner_name(key: Tuple[str, str], name: Optional[str]) -> None:
+    if name is None:
+        return
+    with _OWNER_NAME_LOCK:
+        _OWNER_NAME_CACHE[key] = name
+        _OWNER_NAME_CACHE.move_to_end(key)
+        while len(_OWNER_NAME_CACHE) > _OWNER_NAME_CACHE_SIZE:
+            _OWNER_NAME_CACHE.popitem(last=False)
+
+
+@retry_on_expired_session
 def resolve_owner_names_tool(owner_ids: List[str]) -> List[Dict[str, Optional[str]]]:
     """
     Translate a list of OwnerId values into [{id, name}] pairs.
     Supports Users (005...) and Groups/Queues (00G...). Missing/unknown -> name=None.
     Preserves input order and de-duplicates internally.
     """
-    sf = get_sf_connection()
     ids = [i for i in (owner_ids or []) if i]
     if not ids:
         return []
-    uniq = list(dict.fromkeys(ids))
-
-    user_ids = [i for i in uniq if i.startswith("005")]
-    group_ids = [i for i in uniq if i.startswith("00G")]
-    other_ids = [i for i in uniq if i not in user_ids and i not in group_ids]
 
     id_to_name: Dict[str, Optional[str]] = {}
+    pending: Dict[str, List[str]] = {"User": [], "Group": []}
+    for i in dict.fromkeys(ids):
+        key = (_owner_kind(i), i)
+        name = _cached_owner_name(key)
+        if name is not None:
+            id_to_name[i] = name
+        else:
+            pending[key[0]].append(i)
 
-    def _query(obj: str, ids_subset: List[str], select: str = "Id, Name"):
-        if not ids_subset:
-            return
-        for chunk in _chunk(ids_subset, 200):
-            ids_escaped = ["'" + str(x).replace("'", "\\'") + "'" for x in chunk]
-            in_list = ",".join(ids_escaped)
-            soql = f"SELECT {select} FROM {obj} WHERE Id IN ({in_list})"
-            try:
-                for r in sf.query(soql).get("records", []):
-                    _id = r.get("Id")
-                    _nm = r.get("Name")
-                    if _id:
-                        id_to_name[_id] = _nm
-            except Exception:
-                pass
-
-    _query("User", user_ids)
-    _query("Group", group_ids + other_ids)
-
-    out: List[Dict[str, Optional[str]]] = []
-    for orig in ids:
-        out.append({"id": orig, "name": id_to_name.get(orig)})
-    return out
+    if pending["User"] or pending["Group"]:
+        sf = get_sf_connection()
+
+        # One IN() query per 200 ids and object instead of one query per id
+        for obj, ids_subset in pending.items():
+            for chunk in _chunk(ids_subset, 200):
+                in_list = ",".join("'" + _escape_soql_literal(str(x)) + "'" for x in chunk)
+                soql = f"SELECT Id, Name FROM {obj} WHERE Id IN ({in_list})"
+                try:
+                    recs = sf.query_all(soql).get("records", [])
+                except SalesforceExpiredSession:
+                    raise
+                except Exception:
+                    continue  # leave the chunk unresolved (and uncached)
+                found = {r.get("Id"): r.get("Name") for r in recs if r.get("Id")}
+                # Salesforce answers with 18-char Ids; a 15-char input is their prefix
+                found_15 = {k[:15]: v for k, v in found.items()}
+                for x in chunk:
+                    name = found.get(x) or (found_15.get(x) if len(x) == 15 else None)
+                    id_to_name[x] = name
+                    _remember_owner_name((obj, x), name)
+
+    return [{"id": orig, "name": id_to_name.get(orig)} for orig in ids]
 
 
 
@@ -2,13 +2,13 @@ from fastmcp import FastMCP
 import mcp_salesforce.agent_generate_SOQL as sf_agent
 import mcp_salesforce.helpers as helpers
 from typing import Any, Dict, List, Optional, Union
-from simple_salesforce.exceptions import SalesforceMalformedRequest
+from simple_salesforce.exceptions import SalesforceExpiredSession, SalesforceMalformedRequest
 
 mcp = FastMCP("Salesforce MCP Server", auth=None)
 
 
 @mcp.tool
-def generate_soql_from_input(user_input: str) -> Union[str, Dict[str, Any]]:
+async def generate_soql_from_input(user_input: str) -> Union[str, Dict[str, Any]]:
     """
     Generate a SOQL string from natural language using your agent and
     return a compact result dict.
@@ -21,16 +21,14 @@ def generate_soql_from_input(user_input: str) -> Union[str, Dict[str, Any]]:
       }
     """
 
-    return sf_agent.call_agent_generate_soql(user_input)
+    return await sf_agent.acall_agent_generate_soql(user_input)
  
 
-def _strip_attrs(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    return [{k: v for k, v in r.items() if k != "attributes"} for r in rows or []]
-
 # Use your existing connection helper
 # def _require_sf() -> Salesforce: ...  # assumed available in your module
 
 @mcp.tool  # replace with @mcp.tool if that's your decorator
+@helpers.retry_on_expired_session
 def execute_soql_tool(
     soql: str,
     limit: int = 2000,
@@ -93,7 +91,7 @@ def execute_soql_tool(
                     done = False  # we stopped early due to cap
 
         if strip_attributes:
-            records = _strip_attrs(records)
+            records = helpers._strip_attributes(records)
 
         return {
             "soql": final_soql,
@@ -108,6 +106,8 @@ def execute_soql_tool(
             "soql": soql,
             "error": f"MALFORMED_QUERY: {getattr(e, 'content', e)}"
         }
+    except SalesforceExpiredSession:
+        raise
     except Exception as e:
         return {
             "soql": soql,
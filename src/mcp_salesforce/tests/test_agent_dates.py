@@ -0,0 +1,41 @@
+import datetime
+
+import pytest
+
+import mcp_salesforce.agent_generate_SOQL as agent
+
+_TODAY = datetime.date(2025, 6, 15)
+
+
+@pytest.mark.parametrize("text, want_datetime, expected", [
+    # Salesforce date literals
+    ("today", False, "TODAY"),
+    ("last quarter", True, "LAST_QUARTER"),
+    ("this fiscal year", False, "THIS_FISCAL_YEAR"),
+    # LAST_N_* / NEXT_N_*
+    ("last 30 days", False, "LAST_N_DAYS:30"),
+    ("past 3 months", True, "LAST_N_MONTHS:3"),
+    ("next 2 weeks", False, "NEXT_N_WEEKS:2"),
+    # "N units ago", relative to today
+    ("3 days ago", False, "2025-06-12"),
+    ("2 weeks ago", True, "2025-06-01T00:00:00Z"),
+    ("1 month ago", False, "2025-05-16"),
+    # Full dates
+    ("2025-03-01", False, "2025-03-01"),
+    ("2025-03-01", True, "2025-03-01T00:00:00Z"),
+    ("march 5 2025", False, "2025-03-05"),
+    ("5/3/2025 14:00", False, "2025-05-03T14:00:00Z"),
+])
+def test_local_date_parse(text, want_datetime, expected):
+    assert agent._local_date_parse(text, want_datetime, _TODAY) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "march 2025",   # partial: dateutil would fill in the day
+    "2024",
+    "12",
+    "next friday",  # weekday-only phrases go to the LLM
+    "around the end of the sprint",
+])
+def test_local_date_parse_defers_to_llm(text):
+    assert agent._local_date_parse(text, False, _TODAY) is None
@@ -0,0 +1,79 @@
+import time
+
+import pytest
+
+import mcp_salesforce.core_schema as core_schema
+
+
+class _Resp:
+    def __init__(self, payload):
+        self.status_code = 200
+        self.headers = {}
+        self._payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+class _FakeSF:
+    """Just enough of simple_salesforce for core_schema's raw describe() GETs."""
+
+    headers = {}
+    base_url = "https://example.my.salesforce.com/services/data/v59.0/"
+    sf_version = "59.0"
+
+    def __init__(self):
+        self.account_type_label = "Account Type"
+        self.describes = 0
+        self.session = self
+
+    def restful(self, *args, **kwargs):
+        raise RuntimeError("no composite/batch here")  # forces the per-object describes
+
+    def get(self, url, headers):
+        self.describes += 1
+        obj = url.split("sobjects/", 1)[1].split("/", 1)[0]
+        label = self.account_type_label if obj == "Account" else "Type"
+        return _Resp({"fields": [
+            {"name": "Id", "label": "Id", "type": "id"},
+            {"name": "Name", "label": "Name", "type": "string"},
+            {"name": "Type", "label": label, "type": "string"},
+        ]})
+
+
+@pytest.fixture
+def fake_sf(monkeypatch, tmp_path):
+    sf = _FakeSF()
+    monkeypatch.setattr(core_schema.helpers, "get_sf_connection", lambda: sf)
+    monkeypatch.setattr(core_schema, "DISK_CACHE_PATH", tmp_path / "core_describe.pkl")
+    monkeypatch.setattr(
+        core_schema, "_object_cache", {obj: core_schema._CachedResult() for obj in core_schema.FIELD_CANDIDATES}
+    )
+    core_schema._clear_derived_caches()
+    yield sf
+    core_schema._clear_derived_caches()
+
+
+def test_derived_caches_expire_with_schema_ttl(fake_sf, monkeypatch):
+    assert core_schema.get_schema_for_attribute("Account.Type")["label"] == "Account Type"
+    assert core_schema.find_attribute("Account", "type")[1]["label"] == "Account Type"
+    assert core_schema.resolve_object_and_api("Account.Type") == ("Account", "Type")
+    assert core_schema.build_core_field_index_cached()["idx"]["Account.Type"]["label"] == "Account Type"
+    describes = fake_sf.describes
+
+    # Still fresh: everything is answered from memory
+    assert core_schema.get_schema_for_attribute("Account.Type")["label"] == "Account Type"
+    assert fake_sf.describes == describes
+
+    fake_sf.account_type_label = "Kind"
+    later = time.time() + core_schema.SCHEMA_TTL + 1
+    monkeypatch.setattr(core_schema.time, "time", lambda: later)
+
+    assert core_schema.get_schema_for_attribute("Account.Type")["label"] == "Kind"
+    assert core_schema.find_attribute("Account", "type")[1]["label"] == "Kind"
+    assert core_schema.build_core_field_index_cached()["idx"]["Account.Type"]["label"] == "Kind"
+    assert fake_sf.describes > describes
+    assert core_schema.get_cache_stats()["refreshes"] >= 1
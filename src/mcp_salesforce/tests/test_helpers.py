@@ -0,0 +1,71 @@
+from collections import OrderedDict
+
+import mcp_salesforce.helpers as helpers
+
+
+def test_flatten_record_handles_ordered_dicts():
+    # simple_salesforce parses responses with object_pairs_hook=OrderedDict
+    rec = OrderedDict([
+        ("attributes", OrderedDict([("type", "Opportunity")])),
+        ("Id", "006000000000001"),
+        ("Account", OrderedDict([
+            ("attributes", OrderedDict([("type", "Account")])),
+            ("Name", "Acme"),
+            ("Owner", OrderedDict([("attributes", OrderedDict([("type", "User")])), ("Name", "Bob")])),
+        ])),
+        ("Amount", 10.0),
+        ("Partner", None),
+    ])
+
+    assert helpers._flatten_record(rec) == {
+        "Id": "006000000000001",
+        "Account.Name": "Acme",
+        "Account.Owner.Name": "Bob",
+        "Amount": 10.0,
+        "Partner": None,
+    }
+    assert list(helpers._flatten_record(rec)) == ["Id", "Account.Name", "Account.Owner.Name", "Amount", "Partner"]
+
+
+class _Opportunity:
+    def describe(self):
+        return {"fields": [
+            {"name": "Name", "type": "string"},
+            {"name": "Amount", "type": "currency"},
+            {"name": "IsWon", "type": "boolean"},
+            {"name": "CreatedDate", "type": "datetime"},
+        ]}
+
+    def query(self, soql):
+        yield "Name,Amount,IsWon,CreatedDate\nAcme,1234.5,true,2024-01-05T10:20:30.000Z\nBeta,,false,2024-01-06T00:00:00.000Z\n"
+
+
+class _BulkSF:
+    Opportunity = _Opportunity()
+
+    class bulk2:
+        Opportunity = _Opportunity()
+
+    def query_all(self, soql):
+        return {"records": [
+            OrderedDict([("attributes", {"type": "Opportunity"}), ("Name", "Acme"), ("Amount", 1234.5),
+                         ("IsWon", True), ("CreatedDate", "2024-01-05T10:20:30.000+0000")]),
+            OrderedDict([("attributes", {"type": "Opportunity"}), ("Name", "Beta"), ("Amount", None),
+                         ("IsWon", False), ("CreatedDate", "2024-01-06T00:00:00.000+0000")]),
+        ]}
+
+
+class _NoBulkSF(_BulkSF):
+    class bulk2:
+        class Opportunity:
+            @staticmethod
+            def query(soql):
+                raise RuntimeError("Bulk API disabled")
+
+
+def test_bulk_and_query_all_rows_have_the_same_types():
+    soql = "SELECT Name, Amount, IsWon, CreatedDate FROM Opportunity"
+    bulk = helpers._query_all_records(_BulkSF(), "Opportunity", soql)
+    rest = helpers._query_all_records(_NoBulkSF(), "Opportunity", soql)
+    assert bulk == rest
+    assert bulk[0] == {"Name": "Acme", "Amount": 1234.5, "IsWon": True, "CreatedDate": "2024-01-05T10:20:30.000+0000"}